@@ -23,6 +23,8 @@ from ..utils.git_utils import GitUtils
 console = Console()
 logger = logging.getLogger(__name__)
 
+PATH_BLOCK_PATTERN = re.compile(r"```(?:\w*:)?(.+?)\n(.*?)\n```", re.DOTALL)
+
 # --- Global for non-interactive signal handling ---
 _should_stop_generation = False
 
@@ -51,7 +53,7 @@ class CodeCommands:
             request = await self._prepare_request(prompt, files)
 
             async with AIService(self.config) as ai_service:
-                response_content = ""
+                chunks = []
                 with Progress(
                     SpinnerColumn(),
                     TextColumn("[progress.description]{task.description}"),
@@ -64,10 +66,10 @@ class CodeCommands:
                             progress.stop()
                             console.print("\n[yellow]Code generation stopped by user.[/yellow]")
                             break
-                        response_content += chunk
+                        chunks.append(chunk)
                 
                 if not _should_stop_generation:
-                    await self._display_and_process_response(response_content, show_diff, apply_changes)
+                    await self._display_and_process_response("".join(chunks), show_diff, apply_changes)
 
         except Exception as e:
             logger.error(f"Error during code generation: {e}", exc_info=True)
@@ -107,18 +109,19 @@ class CodeCommands:
             console.print("[yellow]Changes not applied.[/yellow]")
             return
 
-        for file_path_str, code in code_blocks.items():
-            file_path = Path(file_path_str)
-            if show_diff:
+        targets = [(Path(file_path_str), code) for file_path_str, code in code_blocks.items()]
+        if show_diff:
+            for file_path, code in targets:
                 await self._show_file_diff(file_path, code)
-            await self._apply_code_changes(file_path, code)
+
+        # Writes are independent of each other; _apply_code_changes reports its own errors.
+        await asyncio.gather(*(self._apply_code_changes(file_path, code) for file_path, code in targets))
 
         console.print("[green]✓ Changes applied successfully.[/green]")
 
     def _extract_file_content_from_response(self, content: str) -> Dict[str, str]:
         """Extracts code blocks that have a file path specified in the language hint."""
-        pattern = re.compile(r"```(?:\w*:)?(.+?)\n(.*?)\n```", re.DOTALL)
-        matches = pattern.findall(content)
+        matches = PATH_BLOCK_PATTERN.findall(content)
 
         code_blocks = {}
         for path, code in matches:
@@ -132,7 +135,7 @@ class CodeCommands:
         try:
             if file_path.exists():
                 original_code = await self.file_service.read_file(file_path)
-                diff = self.file_utils.generate_diff(original_code, new_code, str(file_path))
+                diff = await asyncio.to_thread(self.file_utils.generate_diff, original_code, new_code, str(file_path))
                 panel_title = f"Diff for {file_path}"
                 syntax_lang = "diff"
             else:
@@ -1,15 +1,15 @@
 import asyncio
 import questionary
 from rich.console import Console
-from pathlib import Path
 
 from ...logic.agent import agent_main
 from ...logic import file_logic, git_logic, github_logic, indexing_logic, code_logic
-from ...services.github_service import GitHubService
-from ...utils.git_utils import GitUtils
 
 console = Console()
 
+# /issue_list --filter values that map to something other than themselves.
+ISSUE_FILTER_ALIASES = {'all': None}
+
 # --- File Operations ---
 async def handle_new_file(session, file_path: str):
     success = await file_logic.new_file(session, file_path)
@@ -33,6 +33,9 @@ async def handle_index(session):
     if file_contents:
         session.current_files.clear()
         session.current_files.update(file_contents)
+        session.invalidate_file_index()
+        # The new index was written by another store; pick it up on the next search.
+        session.vector_store.reload()
 
 async def handle_optimize_file(session, filename: str):
     """Handler for the /optimize command with proper cancellation."""
@@ -67,43 +70,51 @@ async def handle_scan(session):
 # --- Git & GitHub Operations ---
 async def handle_git_add(session, files: list[str]):
     sanitized_files = [f[1:] if f.startswith('@') else f for f in files]
-    await git_logic.add(sanitized_files)
+    await git_logic.add(session, sanitized_files)
 
 async def handle_git_commit(session, message: str):
-    await git_logic.commit(message)
+    await git_logic.commit(session, message)
     
 async def handle_git_switch(session, branch: str):
-    await git_logic.switch(branch if branch else None)
+    await git_logic.switch(session, branch if branch else None)
     
 async def handle_git_pull(session):
-    await git_logic.pull()
+    await git_logic.pull(session)
 
 async def handle_git_push(session):
-    await git_logic.push()
+    await git_logic.push(session)
 
 async def handle_review(session, show_diff: bool = False):
     """Dispatcher for the review -> commit -> push -> PR workflow."""
-    commit_success, branch_name = await git_logic.review_and_commit(show_diff=show_diff)
+    commit_success, branch_name = await git_logic.review_and_commit(session, show_diff=show_diff)
     if not commit_success:
         return
 
     # --- NEW PUSH -> PR FLOW ---
     if await questionary.confirm("Push these changes to the remote?", default=True, auto_enter=False).ask_async():
-        git_utils = GitUtils()
-        with console.status(f"Pushing '{branch_name}'...", spinner="bouncingBall"):
-            await git_utils.push(session.config.work_dir, branch_name, set_upstream=True)
-        console.print(f"[green]✓ Branch '{branch_name}' pushed successfully.[/green]")
-
-        # Now, intelligently ask about PR creation
-        service = GitHubService(session.config)
-        existing_pr_url = await service.check_for_open_pr(branch_name)
-
-        if existing_pr_url:
-            console.print(f"[yellow]An open Pull Request already exists for this branch:[/yellow] {existing_pr_url}")
-            return
-            
-        if await questionary.confirm("Create a Pull Request for this branch?", default=True, auto_enter=False).ask_async():
-            await github_logic.interactive_pr_creation(session)
+        git_utils = session.git_utils
+        # Push in the background; the PR lookup and prompts below don't need it finished.
+        push_task = asyncio.create_task(git_utils.push(session.config.work_dir, branch_name, set_upstream=True))
+
+        try:
+            # Now, intelligently ask about PR creation
+            service = session.github_service
+            existing_pr_url = await service.check_for_open_pr(branch_name)
+
+            if existing_pr_url:
+                pending, push_task = push_task, None
+                await github_logic.finish_push(pending, branch_name)
+                console.print(f"[yellow]An open Pull Request already exists for this branch:[/yellow] {existing_pr_url}")
+                return
+                
+            if await questionary.confirm("Create a Pull Request for this branch?", default=True, auto_enter=False).ask_async():
+                # The PR flow takes over the push and reports it on every exit.
+                pending, push_task = push_task, None
+                await github_logic.interactive_pr_creation(session, pending_push=(branch_name, pending))
+        finally:
+            # Report the push even when the PR lookup fails (no token, no GitHub origin).
+            if push_task is not None:
+                await github_logic.finish_push(push_task, branch_name)
 
 async def handle_pr_approve(session, pr_number_str: str):
     await github_logic.approve_pr(session, pr_number_str)
@@ -119,8 +130,8 @@ async def handle_create_repo(session):
 
 async def handle_git_create_branch(session):
     """Creates and switches to a new local branch."""
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     if not await git_utils.is_git_repo(repo_path): return console.print("[red]Not a git repository.[/red]")
     
     branch_name = await questionary.text("Enter name for new local branch:").ask_async()
@@ -148,29 +159,23 @@ async def handle_pr_review(session, pr_number_str: str):
 
 # --- Git ---
 async def handle_git_log(session):
-    await git_logic.log()
+    await git_logic.log(session)
 
 # --- GitHub ---
 async def handle_issue_list(session, args):
     """Dispatcher for listing issues with filter handling."""
-    assignee = None # Default is None, which logic layer will treat as '*'
-    
-    if args and args[0].lower() == '--filter' and len(args) > 1:
-        filter_value = args[1].lower()
-        if filter_value == 'all':
-            # 'all' means no filter, so we pass None to the logic layer
-            assignee = None
-        else:
-            # Pass 'none', '*', or a username directly
-            assignee = filter_value
-    # Retain legacy support for /issue_list <username>
-    elif args and not args[0].startswith('--'):
-        assignee = args[0]
-    
-    # NEW: If no args, default to '*'
     if not args:
         assignee = '*'
-        
+    elif args[0].lower() == '--filter' and len(args) > 1:
+        # 'all' means no filter; 'none', '*' or a username pass through.
+        filter_value = args[1].lower()
+        assignee = ISSUE_FILTER_ALIASES.get(filter_value, filter_value)
+    elif not args[0].startswith('--'):
+        # Retain legacy support for /issue_list <username>
+        assignee = args[0]
+    else:
+        assignee = None # The logic layer treats None as '*'
+
     await github_logic.list_issues(session, assignee)
 
 async def handle_pr_list(session):
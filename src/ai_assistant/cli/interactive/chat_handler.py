@@ -1,4 +1,6 @@
 import asyncio
+import os
+import stat
 import re
 from pathlib import Path
 from typing import Optional
@@ -6,180 +8,241 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.syntax import Syntax
-from ...utils.file_utils import FileUtils
-from ...services.ai_service import AIService
+from ...utils.file_utils import FileUtils, build_repo_context
 from ...models.request import CodeRequest
 from ...utils.parsing_utils import extract_file_content_from_response
 
 console = Console()
 
+# Upper bound on mentions read at the same time for one message.
+MAX_CONCURRENT_MENTIONS = 8
+
+# Upper bound on snippet text taken from any one file per message.
+MAX_SNIPPET_CHARS_PER_FILE = 8192
+
+PATH_MENTION_PATTERN = re.compile(r"""
+    @(\S+) |                                  # @-mentions (Group 1)
+    (['"]) (.*?) \2 |                         # Quoted paths (Group 2, 3)
+    (?<!\S) ( \S*[/\\]\S* | \S+\.\S+ ) (?=\s|$)  # Bare paths with slashes or a dot (Group 4)
+""", re.VERBOSE)
+PATH_MENTION_CHARS = ('@', '"', "'", '/', '\\', '.')
+
+def _stat_mode(path) -> Optional[int]:
+    """Returns the st_mode of path, or None if it cannot be stat'ed."""
+    try:
+        return os.stat(path).st_mode
+    except OSError:
+        return None
+
 class ChatHandler:
     def __init__(self, session):
         self.session = session
         self.config = session.config
-        self._stop_generation = False
         self._generation_task: Optional[asyncio.Task] = None
 
     def stop_generation(self):
-        self._stop_generation = True
         if self._generation_task and not self._generation_task.done():
             self._generation_task.cancel()
             console.print("\n[yellow]Stopping generation...[/yellow]")
 
-    async def _handle_file_apply_logic(self, response_content: str):
-        """Interactively handles the diff and apply logic for file blocks."""
-        file_blocks = extract_file_content_from_response(response_content)
-        if not file_blocks:
-            return
-        console.print("\n[bold cyan]AI has suggested file changes. Review now or use /apply later.[/bold cyan]")
-
     async def _stream_and_render_response(self, request: CodeRequest):
         """
         Streams the AI response to a buffer while showing a spinner,
         then renders the complete, final response beautifully.
         """
-        response_content = ""
-        status_task = None
+        chunks = []
         try:
-            status_task = asyncio.create_task(self._show_status("[cyan]Helios is thinking[/cyan]"))
-            
-            async with AIService(self.config) as ai_service:
-                async for chunk in ai_service.stream_generate(request):
-                    if self._stop_generation:
-                        raise asyncio.CancelledError
-                    response_content += str(chunk)
-            
-            if status_task and not status_task.done():
-                status_task.cancel()
-                try:
-                    await status_task
-                except asyncio.CancelledError:
-                    pass
-            
+            # The spinner animates on Rich's own refresh thread; nothing is rendered per chunk.
+            with console.status("[cyan]Helios is thinking[/cyan]", spinner="point", spinner_style="cyan"):
+                async for chunk in self.session.ai_service.stream_generate(request):
+                    chunks.append(chunk)
+            response_content = "".join(chunks)
+
             if not response_content:
                 return
 
-            self.session.last_ai_response_content = response_content
             self.session.conversation_history.append({"role": "assistant", "content": response_content})
-            
-            file_blocks = extract_file_content_from_response(response_content)
-            
-            console.print()
-
-            if not file_blocks:
-                console.print(Markdown(response_content, code_theme="vim"))
-            else:
-                for block in file_blocks:
-                    syntax_lang = FileUtils.get_language_from_extension(Path(block['filename']).suffix)
-                    
-                    syntax_content = Syntax(
-                        block['code'], 
-                        lexer=syntax_lang,
-                        theme="vim",
-                        line_numbers=True,
-                        word_wrap=True,
-                        background_color="default"
-                    )
-                    
-                    console.print(Panel(
-                        syntax_content,
-                        title=f"[bold cyan]File: {block['filename']}[/bold cyan]",
-                        border_style="blue",
-                        expand=False,
-                        padding=(1, 2)
-                    ))
-            
-            if file_blocks:
-                console.print("\n[yellow]AI has suggested file changes. Use `/apply` to review and apply them.[/yellow]")
+            await self._handle_code_response(response_content)
 
         except asyncio.CancelledError:
-            if status_task and not status_task.done():
-                status_task.cancel()
-                try:
-                    await status_task
-                except asyncio.CancelledError:
-                    pass
             console.print()
         except Exception as e:
-            if status_task and not status_task.done():
-                status_task.cancel()
-                try:
-                    await status_task
-                except asyncio.CancelledError:
-                    pass
             console.print(f"[bold red]Error during response generation: {e}[/bold red]")
-            import traceback
-            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+            if self.config.verbose:
+                console.print_exception()
 
-    async def _show_status(self, message):
-        """Show status spinner that can be cancelled"""
-        try:
-            with console.status(message, spinner="point", spinner_style="cyan"):
-                while True:
-                    await asyncio.sleep(0.1)
-        except asyncio.CancelledError:
-            pass
+    async def _handle_code_response(self, response_content: str):
+        """
+        Renders a finished AI response, parsing its file blocks once.
+        Also used by /optimize, which produces its response outside the chat stream.
+        """
+        self.session.last_ai_response_content = response_content
+        file_blocks = extract_file_content_from_response(response_content)
+        # Hand the parse to /save and /apply so they don't repeat it.
+        self.session._parsed_blocks_cache = (response_content, file_blocks)
+        
+        console.print()
+
+        if not file_blocks:
+            console.print(Markdown(response_content, code_theme="vim"))
+        else:
+            for block in file_blocks:
+                syntax_lang = FileUtils.get_language_from_extension(os.path.splitext(block['filename'])[1])
+                
+                syntax_content = Syntax(
+                    block['code'], 
+                    lexer=syntax_lang,
+                    theme="vim",
+                    line_numbers=True,
+                    word_wrap=True,
+                    background_color="default"
+                )
+                
+                console.print(Panel(
+                    syntax_content,
+                    title=f"[bold cyan]File: {block['filename']}[/bold cyan]",
+                    border_style="blue",
+                    expand=False,
+                    padding=(1, 2)
+                ))
+        
+        if file_blocks:
+            console.print("\n[yellow]AI has suggested file changes. Use `/apply` to review and apply them.[/yellow]")
+
+    async def _resolve_mention(self, mention: str, semaphore: asyncio.Semaphore):
+        """
+        Loads the file or directory a mention points at.
+        Returns (status lines, {relative path: content}) so the caller can print and merge in order.
+        """
+        async with semaphore:
+            possible_path = Path(mention).expanduser()
+            if not possible_path.is_absolute():
+                full_path = self.config.work_dir / mention
+            else:
+                full_path = possible_path
+            # Fold '..' away so the containment check and relative_to below see the real location.
+            full_path = Path(os.path.normpath(full_path))
+
+            # One stat answers both "does it exist" and "file or directory".
+            mode = _stat_mode(full_path)
+            if mode is None:
+                # A bare file name or a trailing sub-path may still match exactly one file already in context.
+                # Either separator may be typed, so compare path components rather than strings.
+                mention_parts = Path(os.path.normpath(mention.replace('\\', '/').lstrip('/'))).parts
+                matches = self.session.files_named(mention_parts[-1]) if mention_parts else []
+                if len(mention_parts) > 1:
+                    matches = [path for path in matches if Path(path).parts[-len(mention_parts):] == mention_parts]
+                if len(matches) > 1:
+                    return [f"[yellow]Warning: '{mention}' matches several files: {', '.join(matches)}. Mention the full path.[/yellow]"], {}
+                if matches:
+                    full_path = self.config.work_dir / matches[0]
+                    mode = _stat_mode(full_path)
+                if mode is None:
+                    return [f"[yellow]Warning: Mentioned path '{mention}' does not exist.[/yellow]"], {}
+
+            if stat.S_ISDIR(mode):
+                if not full_path.is_relative_to(self.config.work_dir):
+                    return [f"[yellow]Warning: Mentioned directory '{mention}' is outside the project.[/yellow]"], {}
+                # The indexed context already holds this subtree; only walk it when nothing is indexed there.
+                relative_dir = str(full_path.relative_to(self.config.work_dir))
+                prefix = "" if relative_dir == "." else relative_dir + os.sep
+                context = {path: content for path, content in self.session.current_files.items() if path.startswith(prefix)}
+                if not context:
+                    dir_context = await asyncio.to_thread(build_repo_context, full_path, self.config)
+                    for file_path, content in dir_context.items():
+                        # build_repo_context keys are relative to the mentioned directory.
+                        relative_path = str((full_path / file_path).relative_to(self.config.work_dir))
+                        context[relative_path] = content
+                return [f"[dim]Added context from directory: {mention}[/dim]"], context
+
+            if stat.S_ISREG(mode):
+                try:
+                    content = await self.session.file_service.read_file(full_path)
+                    relative_path = str(full_path.relative_to(self.config.work_dir))
+                except Exception as e:
+                    return [f"[yellow]Warning: Could not read file {mention}: {e}[/yellow]"], {}
+                return [f"[dim]Added context from file: {mention}[/dim]"], {relative_path: content}
+
+            return [], {}
 
     async def handle(self, message: str, session):
         """Main message handler with robust path detection and multimodal support."""
         try:
-            self._stop_generation = False
-            
             mentioned_context = {}
             
-            path_pattern = re.compile(r"""
-                @([^\s]+) |                                      # @-mentions (Group 1)
-                (['"]) (.*?) \2 |                                  # Quoted paths (Group 2, 3)
-                (?<!\S) ( [^\s]*[/\\][^\s]* | [^\s]+\.[^\s]+ ) (?=\s|$) # Bare paths with slashes or a dot (Group 4)
-            """, re.VERBOSE)
-            
-            found_paths = [m.group(1) or m.group(3) or m.group(4) for m in path_pattern.finditer(message)]
-
-            if found_paths:
-                console.print("[dim]Processing mentions...[/dim]")
-                for mention in set(found_paths):
-                    mention = mention.lstrip('@')
-                    possible_path = Path(mention).expanduser()
-                    if not possible_path.is_absolute():
-                        full_path = self.config.work_dir / mention
-                    else:
-                        full_path = possible_path
-
-                    if not full_path.exists():
-                        console.print(f"[yellow]Warning: Mentioned path '{mention}' does not exist.[/yellow]")
-                        continue
+            # Every pattern branch needs one of these characters; plain chat skips the scan.
+            if any(ch in message for ch in PATH_MENTION_CHARS):
+                path_matches = list(PATH_MENTION_PATTERN.finditer(message))
+            else:
+                path_matches = []
+            found_paths = [m.group(1) or m.group(3) or m.group(4) for m in path_matches]
+
+            # Text outside every mention always needs a search, so it starts right away.
+            remainder = PATH_MENTION_PATTERN.sub(" ", message) if path_matches else message
+            search_task = None
+            if any(ch.isalnum() for ch in remainder):
+                # The embedding search only needs the message, so it runs in a worker thread while mentions resolve.
+                search_task = asyncio.create_task(asyncio.to_thread(self.session.vector_store.search, message, 5))
 
-                    if full_path.is_dir():
-                        console.print(f"[dim]Added context from directory: {mention}[/dim]")
-                        dir_context = build_repo_context(full_path, self.config)
-                        for file_path, content in dir_context.items():
-                            relative_path = str(Path(file_path).relative_to(self.config.work_dir))
-                            mentioned_context[relative_path] = content
-                    elif full_path.is_file():
-                        console.print(f"[dim]Added context from file: {mention}[/dim]")
-                        try:
-                            content = await self.session.file_service.read_file(full_path)
-                            mentioned_context[str(full_path.relative_to(self.config.work_dir))] = content
-                        except Exception as e:
-                            console.print(f"[yellow]Warning: Could not read file {mention}: {e}[/yellow]")
-
-            rag_context = {}
-            with console.status("[dim]Searching for relevant code snippets...[/dim]", spinner="point", spinner_style="[dim]cyan[/dim]"):
-                relevant_chunks = self.session.vector_store.search(message, k=5)
+            resolved = set()
+            mentions_done = False
+            try:
+                if found_paths:
+                    console.print("[dim]Processing mentions...[/dim]")
+                    # Resolve mentions concurrently (bounded), then merge and report in order.
+                    semaphore = asyncio.Semaphore(MAX_CONCURRENT_MENTIONS)
+                    mentions = list(dict.fromkeys(m.lstrip('@') for m in found_paths))
+                    results = await asyncio.gather(*(self._resolve_mention(mention, semaphore) for mention in mentions))
+                    for mention, (notes, context) in zip(mentions, results):
+                        if notes:
+                            console.print("\n".join(notes))
+                        if context:
+                            resolved.add(mention)
+                        mentioned_context.update(context)
+                mentions_done = True
+            finally:
+                # If mention handling failed or was cancelled, the search is never awaited; don't leak it.
+                if not mentions_done and search_task is not None and not search_task.done():
+                    search_task.cancel()
+
+            # A message made only of mentions is still searched on whichever ones did not resolve
+            # (plain quoted text, missing paths); resolved files are sent in full instead.
+            if search_task is None:
+                unresolved = [m.group(0) for m, path in zip(path_matches, found_paths) if path.lstrip('@') not in resolved]
+                if any(ch.isalnum() for text in unresolved for ch in text):
+                    search_task = asyncio.create_task(asyncio.to_thread(self.session.vector_store.search, message, 5))
+
+            snippets = {}
+            if search_task is not None:
+                with console.status("[dim]Searching for relevant code snippets...[/dim]", spinner="point", spinner_style="[dim]cyan[/dim]"):
+                    relevant_chunks = await search_task
+                seen = set()
+                snippet_chars = {}
                 for chunk in relevant_chunks:
-                    if chunk['file_path'] not in mentioned_context:
-                        if chunk['file_path'] not in rag_context:
-                            rag_context[chunk['file_path']] = ""
-                        rag_context[chunk['file_path']] += f"\n... (Snippet) ...\n{chunk['text']}\n"
-            
-            final_context = {**rag_context, **mentioned_context}
+                    file_path, text = chunk['file_path'], chunk['text']
+                    if file_path in mentioned_context or (file_path, text) in seen:
+                        continue
+                    seen.add((file_path, text))
+                    # Keep one file's hits from crowding out the rest of the prompt. A file's first
+                    # (most relevant) snippet is always kept, truncated if it is over the cap alone.
+                    used = snippet_chars.get(file_path)
+                    if used is None:
+                        text = text[:MAX_SNIPPET_CHARS_PER_FILE]
+                        used = 0
+                    elif used + len(text) > MAX_SNIPPET_CHARS_PER_FILE:
+                        continue
+                    snippet_chars[file_path] = used + len(text)
+                    snippets.setdefault(file_path, []).append(f"\n... (Snippet) ...\n{text}\n")
+            # Snippet files never overlap mentioned ones, so the two merge without overwriting.
+            final_context = {file_path: "".join(parts) for file_path, parts in snippets.items()}
+            final_context.update(mentioned_context)
             session.conversation_history.append({"role": "user", "content": message})
             
             request = CodeRequest(
                 prompt=message,
                 files=final_context,
                 repository_files=list(session.current_files.keys()),
-                conversation_history=session.conversation_history.copy(),
+                conversation_history=session.history_window(),
             )
 
             self._generation_task = asyncio.create_task(self._stream_and_render_response(request))
@@ -189,5 +252,5 @@ class ChatHandler:
             console.print(f"[bold red]Regex Error: {e}[/bold red]")
         except Exception as e:
             console.print(f"[bold red]Error handling chat message: {e}[/bold red]")
-            import traceback
-            console.print(f"[dim]{traceback.format_exc()}[/dim]")
\ No newline at end of file
+            if self.config.verbose:
+                console.print_exception()
\ No newline at end of file
@@ -76,6 +76,6 @@ class CommandHandler:
                 display.show_help()
 
         except Exception as e:
-            import traceback
             self.console.print(f"[red]Error executing command '/{cmd}': {e}[/red]")
-            self.console.print(f"[dim]{traceback.format_exc()}[/dim]")
\ No newline at end of file
+            if self.session.config.verbose:
+                self.console.print_exception()
\ No newline at end of file
@@ -2,12 +2,11 @@ from rich.console import Console
 from rich.panel import Panel
 from pathlib import Path
 from typing import Dict
-import os
 
 console = Console()
 
 def print_helios_banner():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    console.clear()
     banner = """
     ██╗  ██╗███████╗██╗     ██╗ ██████╗ ███████╗
     ██║  ██║██╔════╝██║     ██║██╔═══██╗██╔════╝
@@ -1,3 +1,4 @@
+import os
 import signal
 from pathlib import Path
 from typing import Optional, Iterable
@@ -13,6 +14,7 @@ from .command_handler import CommandHandler
 from .chat_handler import ChatHandler
 from . import display
 from ...core.config import Config
+from ...services.ai_service import AIService
 from ...services.file_service import FileService
 from ...services.github_service import GitHubService
 from ...services.vector_store import VectorStore
@@ -21,6 +23,12 @@ from ...utils.git_utils import GitUtils
 
 console = Console()
 
+# Messages of history sent with each request. The window only moves once it exceeds
+# MAX_HISTORY_MESSAGES and then jumps back to MIN_HISTORY_MESSAGES, so consecutive
+# prompts share a stable prefix the model server can reuse.
+MAX_HISTORY_MESSAGES = 20
+MIN_HISTORY_MESSAGES = 10
+
 # --- NEW: Custom Completer for file paths ---
 class FilePathCompleter(Completer):
     def __init__(self, session):
@@ -36,9 +44,8 @@ class FilePathCompleter(Completer):
             if word_before_cursor.startswith('@'):
                 # The word we are completing is after the '@'
                 search_text = word_before_cursor[1:]
-                # Get current file list dynamically from session
-                current_files = sorted(list(set(self.session.current_files.keys())))
-                for path in current_files:
+                # Get current file list dynamically from session (dict keys are already unique)
+                for path in sorted(self.session.current_files):
                     yield Completion(
                         path,
                         start_position=-len(search_text),
@@ -48,18 +55,19 @@ class FilePathCompleter(Completer):
 class StatusBar:
     """Manages the status bar information."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, git_utils: GitUtils):
         self.config = config
-        self.git_utils = GitUtils()
+        self.git_utils = git_utils
         self._current_dir = str(Path.cwd())
         self._current_branch = None
         self._current_model = config.model_name
         
-    async def get_current_branch(self) -> str:
+    async def get_current_branch(self, cwd: Optional[Path] = None) -> str:
         """Get the current git branch."""
+        cwd = cwd or Path.cwd()
         try:
-            if await self.git_utils.is_git_repo(Path.cwd()):
-                branch = await self.git_utils.get_current_branch(Path.cwd())
+            if await self.git_utils.is_git_repo(cwd):
+                branch = await self.git_utils.get_current_branch(cwd)
                 return branch or "no-branch"
             return "no-git"
         except Exception:
@@ -67,8 +75,9 @@ class StatusBar:
     
     async def update_status(self):
         """Update status information."""
-        self._current_dir = str(Path.cwd())
-        self._current_branch = await self.get_current_branch()
+        cwd = Path.cwd()
+        self._current_dir = str(cwd)
+        self._current_branch = await self.get_current_branch(cwd)
         self._current_model = self.config.model_name
         
     def get_toolbar_text(self) -> HTML:
@@ -92,16 +101,56 @@ class InteractiveSession:
     def __init__(self, config: Config):
         self.config = config
         self.file_service = FileService(config)
-        self.github_service = GitHubService(config)
+        self.git_utils = GitUtils()
+        self.github_service = GitHubService(config, git_utils=self.git_utils)
         self.vector_store = VectorStore(config)
+        # One client for every chat turn, so the model endpoint connection is reused.
+        self.ai_service = AIService(config)
         self.conversation_history = []
+        # Index of the first history message sent to the model; see history_window.
+        self._history_window_start = 0
         self.current_files = {} 
         self.last_ai_response_content: Optional[str] = None
+        # (response, blocks) pair so /save and /apply parse a response only once.
+        self._parsed_blocks_cache: Optional[tuple] = None
+        self._model_choices_cache: Optional[tuple] = None
+        # basename -> context paths, built lazily from current_files.
+        self._basename_index: Optional[dict] = None
         self.command_handler = CommandHandler(self)
         self.chat_handler = ChatHandler(self)
-        self.status_bar = StatusBar(config)
+        self.status_bar = StatusBar(config, self.git_utils)
         signal.signal(signal.SIGINT, self._handle_interrupt)
 
+    def history_window(self) -> list:
+        """Returns the recent history messages to send with the next request."""
+        if len(self.conversation_history) - self._history_window_start > MAX_HISTORY_MESSAGES:
+            self._history_window_start = len(self.conversation_history) - MIN_HISTORY_MESSAGES
+        return self.conversation_history[self._history_window_start:]
+
+    def reset_history(self):
+        """Clears the conversation history and its window."""
+        self.conversation_history.clear()
+        self._history_window_start = 0
+
+    def files_named(self, name: str) -> list:
+        """Returns the context paths whose file name is `name`."""
+        if self._basename_index is None:
+            index = {}
+            for path in self.current_files:
+                index.setdefault(os.path.basename(path), []).append(path)
+            self._basename_index = index
+        return self._basename_index.get(name, [])
+
+    def set_context_file(self, path: str, content: str):
+        """Adds or updates a context file, keeping the basename index in step with it."""
+        if path not in self.current_files and self._basename_index is not None:
+            self._basename_index.setdefault(os.path.basename(path), []).append(path)
+        self.current_files[path] = content
+
+    def invalidate_file_index(self):
+        """Drops the basename index after current_files is rebuilt."""
+        self._basename_index = None
+
     def _handle_interrupt(self, signum, frame):
         if hasattr(self, 'chat_handler') and self.chat_handler._generation_task and not self.chat_handler._generation_task.done():
             self.chat_handler.stop_generation()
@@ -109,17 +158,18 @@ class InteractiveSession:
             raise KeyboardInterrupt
 
     async def _setup_working_directory(self):
-        helios_dir = Path.cwd() / ".helios"
+        cwd = Path.cwd()
+        helios_dir = cwd / ".helios"
         if helios_dir.exists():
-            console.print(f"[dim]Using existing project root: {Path.cwd()}[/dim]")
+            console.print(f"[dim]Using existing project root: {cwd}[/dim]")
             return
         console.print("[yellow]Helios project not initialized in this directory.[/yellow]")
-        if await questionary.confirm(f"Initialize project in current directory? ({Path.cwd()})", default=True, auto_enter=False).ask_async():
-            if not await GitUtils().is_git_repo(Path.cwd()):
+        if await questionary.confirm(f"Initialize project in current directory? ({cwd})", default=True, auto_enter=False).ask_async():
+            if not await self.git_utils.is_git_repo(cwd):
                 if await questionary.confirm("This directory is not a Git repository. Initialize one now?", default=True, auto_enter=False).ask_async():
-                    await GitUtils().init_repo(Path.cwd())
+                    await self.git_utils.init_repo(cwd)
                     console.print("[green]✓ Git repository initialized.[/green]")
-            (Path.cwd() / ".helios").mkdir(exist_ok=True)
+            helios_dir.mkdir(exist_ok=True)
         else:
             console.print("[red]Initialization cancelled. Exiting.[/red]"); exit(0)
 
@@ -130,6 +180,7 @@ class InteractiveSession:
         file_contents = await indexing_logic.check_and_run_startup_indexing(self.config)
         if file_contents:
             self.current_files.update(file_contents)
+            self.invalidate_file_index()
         else:
             console.print("[yellow]Could not initialize repository context.[/yellow]")
         
@@ -163,29 +214,33 @@ class InteractiveSession:
             bottom_toolbar=self.status_bar.get_toolbar_text,
         )
 
-        while True:
-            try:
-                # Update status bar before each prompt
-                await self.status_bar.update_status()
+        await self.ai_service.open()
+        try:
+            while True:
+                try:
+                    # Update status bar before each prompt
+                    await self.status_bar.update_status()
                 
-                console.print("")
-                user_input = await prompt_session.prompt_async()
+                    console.print("")
+                    user_input = await prompt_session.prompt_async()
                 
-                if not user_input.strip(): continue
-                if user_input.lower() in ['exit', 'quit', 'bye']: display.show_goodbye(); break
+                    if not user_input.strip(): continue
+                    if user_input.lower() in ['exit', 'quit', 'bye']: display.show_goodbye(); break
                 
-                if user_input.startswith('/'):
-                    await self.command_handler.handle(user_input)
-                else:
-                    await self.chat_handler.handle(user_input, self)
-
-            except KeyboardInterrupt:
-                # This is triggered by our custom signal handler
-                console.print("") # Newline after prompt
-                continue 
-            except EOFError:
-                display.show_goodbye(); break
-            except Exception as e:
-                console.print(f"[red]Unexpected error: {e}[/red]")
-                import traceback
-                console.print(f"[dim]{traceback.format_exc()}[/dim]")
\ No newline at end of file
+                    if user_input.startswith('/'):
+                        await self.command_handler.handle(user_input)
+                    else:
+                        await self.chat_handler.handle(user_input, self)
+
+                except KeyboardInterrupt:
+                    # This is triggered by our custom signal handler
+                    console.print("") # Newline after prompt
+                    continue 
+                except EOFError:
+                    display.show_goodbye(); break
+                except Exception as e:
+                    console.print(f"[red]Unexpected error: {e}[/red]")
+                    if self.config.verbose:
+                        console.print_exception()
+        finally:
+            await self.ai_service.close()
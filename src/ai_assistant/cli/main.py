@@ -1,5 +1,6 @@
 import asyncio
 import sys
+import traceback
 from pathlib import Path
 from typing import Optional
 import yaml
@@ -16,6 +17,16 @@ from .interactive import display
 
 console = Console()
 
+def _install_event_loop():
+    """Uses uvloop for the session's event loop when it is available."""
+    if sys.platform == 'win32':
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 async def _run_first_time_setup():
     """Guides the user through an initial setup process."""
     console.print("\n[bold yellow]Welcome to Helios! It looks like this is your first run.[/bold yellow]")
@@ -142,8 +153,10 @@ def cli(ctx, config: Optional[str], verbose: bool, model: Optional[str]):
         if model:
             cfg.set_model(model)
 
+        cfg.verbose = verbose
         ctx.obj = cfg
         setup_logging(verbose)
+        _install_event_loop()
 
         if ctx.invoked_subcommand is None:
             display.print_helios_banner()
@@ -158,7 +171,6 @@ def cli(ctx, config: Optional[str], verbose: bool, model: Optional[str]):
             console.print(f"[red]Configuration Error: {e}[/red]")
             sys.exit(1)
     except Exception as e:
-        import traceback
         console.print(f"[red]Error initializing: {e}[/red]")
         if verbose:
             console.print(traceback.format_exc())
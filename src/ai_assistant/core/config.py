@@ -42,11 +42,13 @@ class Config:
     work_dir: Path = field(default_factory=Path.cwd)
     max_file_size: int = 1024 * 1024  # 1MB
     supported_extensions: List[str] = field(default_factory=lambda: [])
+    verbose: bool = False  # Show full tracebacks for errors in the interactive session.
 
     def __init__(self, config_path: Optional[Path] = None):
         # Manually initialize fields because we are overriding the dataclass __init__
         self.work_dir = Path.cwd()
         self.max_file_size = 1024 * 1024
+        self.verbose = False
         self.supported_extensions = [
             '.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs', '.rb',
             '.html', '.css', '.scss', '.json', '.yaml', '.yml', '.md', '.txt',
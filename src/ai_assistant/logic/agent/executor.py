@@ -38,11 +38,11 @@ class Executor:
         )
         
         request = CodeRequest(prompt=summary_prompt)
-        summary = ""
+        chunks = []
         async with AIService(self.session.config) as ai_service:
             async for chunk in ai_service.stream_generate(request):
-                summary += chunk
-        return summary.strip()
+                chunks.append(chunk)
+        return "".join(chunks).strip()
         
     def _render_step_for_display(self, step: dict[str, Any]) -> Tuple[str, str]:
         """
@@ -10,13 +10,25 @@ from ...models.request import CodeRequest
 from .tools import TOOL_REGISTRY
 from .theme import Theme
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 console = Console()
 
+JSON_FENCE_PATTERN = re.compile(r'```json\s*(\[.*\])\s*```', re.DOTALL)
+JSON_ARRAY_PATTERN = re.compile(r'(\[.*\])', re.DOTALL)
+
 class Planner:
     """
     Handles the planning phase of the agentic workflow.
     It constructs the prompt for the AI, gets a plan, and validates it.
     """
+    # The tool registry is static, so its prompt listing is built once per process.
+    _formatted_tools: Optional[str] = None
+
     def __init__(self, session):
         self.session = session
         self.config = session.config
@@ -24,6 +36,8 @@ class Planner:
 
     def _format_tools_for_prompt(self) -> str:
         """Formats the tool registry into a string for the AI prompt."""
+        if self.tools is TOOL_REGISTRY and Planner._formatted_tools is not None:
+            return Planner._formatted_tools
         prompt_lines = []
         for name, tool in self.tools.items():
             params = tool.get('parameters', {})
@@ -31,7 +45,10 @@ class Planner:
             params_for_ai = {k: v for k, v in params.items() if k not in ['session', 'config']}
             param_str = ", ".join([f"{k}: {v}" for k, v in params_for_ai.items()])
             prompt_lines.append(f"- `{name}({param_str})`: {tool['description']}")
-        return "\n".join(prompt_lines)
+        formatted = "\n".join(prompt_lines)
+        if self.tools is TOOL_REGISTRY:
+            Planner._formatted_tools = formatted
+        return formatted
 
     def _validate_plan(self, plan: List[Any]) -> Tuple[bool, str]:
         """Validates the structure and commands of the generated plan."""
@@ -52,12 +69,12 @@ class Planner:
         Extracts a JSON array from the model's response, handling markdown fences.
         """
         # First, try to find JSON within a markdown code block
-        match = re.search(r'```json\s*(\[.*\])\s*```', response, re.DOTALL)
+        match = JSON_FENCE_PATTERN.search(response)
         if match:
             return match.group(1)
         
         # If not in a code block, try to find any JSON array
-        match = re.search(r'(\[.*\])', response, re.DOTALL)
+        match = JSON_ARRAY_PATTERN.search(response)
         if match:
             return match.group(1)
             
@@ -90,22 +107,26 @@ class Planner:
         )
         
         request = CodeRequest(prompt=final_prompt)
-        raw_response = ""
+        chunks = []
         with console.status(f"[{Theme.PROMPT}][dim]The Knight is formulating a plan[/dim][/{Theme.PROMPT}]", spinner="bouncingBall", spinner_style=f"[dim]{Theme.PROMPT}[/dim]"):
             async with AIService(self.config) as ai_service:
                 async for chunk in ai_service.stream_generate(request):
-                    raw_response += chunk
+                    chunks.append(chunk)
+        raw_response = "".join(chunks)
 
         plan_str = self._extract_json_from_response(raw_response)
         
         if not plan_str:
-            console.print(Panel("The AI did not return a valid plan in the expected format.", border_style=Theme.ERROR, title=f"[{Theme.ERROR}]Planning Error[/{Theme.ERROR}]"))
-            console.print("[bold dim]Model's Raw Response:[/bold dim]")
-            console.print(f"[dim]{raw_response}[/dim]")
+            console.print(
+                Panel("The AI did not return a valid plan in the expected format.", border_style=Theme.ERROR, title=f"[{Theme.ERROR}]Planning Error[/{Theme.ERROR}]"),
+                "[bold dim]Model's Raw Response:[/bold dim]",
+                f"[dim]{raw_response}[/dim]",
+                sep="\n",
+            )
             return None
 
         try:
-            plan = json.loads(plan_str)
+            plan = _loads(plan_str)
             is_valid, error_message = self._validate_plan(plan)
             
             if not is_valid:
@@ -115,7 +136,10 @@ class Planner:
             return plan
             
         except json.JSONDecodeError as e:
-            console.print(Panel(f"[bold]Error:[/bold] Failed to decode the JSON plan. {e}", border_style=Theme.ERROR, title=f"[{Theme.ERROR}]JSON Decode Error[/{Theme.ERROR}]"))
-            console.print("[bold dim]Extracted JSON String:[/bold dim]")
-            console.print(f"[dim]{plan_str}[/dim]")
+            console.print(
+                Panel(f"[bold]Error:[/bold] Failed to decode the JSON plan. {e}", border_style=Theme.ERROR, title=f"[{Theme.ERROR}]JSON Decode Error[/{Theme.ERROR}]"),
+                "[bold dim]Extracted JSON String:[/bold dim]",
+                f"[dim]{plan_str}[/dim]",
+                sep="\n",
+            )
             return None
\ No newline at end of file
@@ -12,9 +12,7 @@ from rich.panel import Panel
 
 from ...logic import file_logic
 from ...services.ai_service import AIService
-from ...services.github_service import GitHubService
 from ...models.request import CodeRequest
-from ...utils.git_utils import GitUtils
 from ...utils.parsing_utils import extract_file_content_from_response
 
 console = Console()
@@ -36,21 +34,15 @@ async def review_and_commit_changes(session, commit_message: str, show_diff: boo
     A non-interactive tool for the agent to review and commit changes.
     It stages all unstaged files, displays the diff, commits with a given message, and optionally pushes changes.
     """
-    git_utils = GitUtils()
+    git_utils = session.git_utils
     repo_path = session.work_dir # Use the session's active work_dir
     
     if not await git_utils.is_git_repo(repo_path):
         console.print("[red]Not a git repository.[/red]")
         return False
 
-    # Stage both tracked (modified) and untracked files
-    unstaged = await git_utils.get_unstaged_files(repo_path)
-    if unstaged:
-        console.print("[dim]Staging modified files...[/dim]")
-        await git_utils.add_files(repo_path, unstaged)
-    
-    # Also stage any untracked files to ensure nothing is missed
-    console.print("[dim]Ensuring all files are staged (including new files)...[/dim]")
+    # A single 'git add .' stages modified, deleted and untracked files alike.
+    console.print("[dim]Staging all changes (including new files)...[/dim]")
     await git_utils.add_files(repo_path, ['.'])
 
     per_file_diffs = await git_utils.get_staged_diff_by_file(repo_path)
@@ -74,7 +66,7 @@ async def review_and_commit_changes(session, commit_message: str, show_diff: boo
         try:
             console.print("[dim]Pushing changes to remote repository...[/dim]")
             current_branch = await git_utils.get_current_branch(repo_path)
-            push_result = await git_utils.push(repo_path, remote="origin", branch=current_branch)
+            await git_utils.push(repo_path, current_branch)
             console.print("[green]✓ Changes pushed to remote repository.[/green]")
         except Exception as e:
             console.print(f"[yellow]Warning: Failed to push changes: {str(e)}[/yellow]")
@@ -93,13 +85,13 @@ async def _get_ai_corrected_command(session, original_command: str, stderr: str)
         "Corrected command:"
     )
     request = CodeRequest(prompt=prompt)
-    correction = ""
+    chunks = []
     async with AIService(session.config) as ai_service:
         async for chunk in ai_service.stream_generate(request):
-            correction += chunk
+            chunks.append(chunk)
     
     # Clean up markdown fences and whitespace
-    return correction.strip().replace('`', '')
+    return "".join(chunks).strip().replace('`', '')
 
 async def run_shell_command(session, command: str, cwd: str, can_fail: bool = False, verbose: bool = False, interactive: bool = False) -> bool:
     """Executes a shell command with real-time output streaming or in interactive mode."""
@@ -262,8 +254,8 @@ async def generate_code_concurrently(session, files: List[Dict[str, Any]], cwd:
     progress = Progress(SpinnerColumn(spinner_name="bouncingBall", style="cyan"), TextColumn("[progress.description]{task.description}"), BarColumn(), TaskProgressColumn(), console=console, transient=True)
 
     async def generate_and_save(file_path_str: str, file_prompt: str, p_task_id: Any):
+        # save_code creates the parent directory, so nothing is made up front.
         full_path = base_dir / file_path_str
-        full_path.parent.mkdir(parents=True, exist_ok=True)
         
         generation_prompt = (
             "You are a code-writing AI. Your only task is to generate the raw code for a single file based on the user's request. "
@@ -277,16 +269,19 @@ async def generate_code_concurrently(session, files: List[Dict[str, Any]], cwd:
         request = CodeRequest(prompt=generation_prompt)
         
         try:
-            generated_code = ""
+            chunks = []
             async with AIService(session.config) as ai_service:
                 async for chunk in ai_service.stream_generate(request):
-                    generated_code += chunk
+                    chunks.append(chunk)
+            generated_code = "".join(chunks)
             
             # The AI might still sometimes add fences, so we strip them just in case.
             code_blocks = extract_file_content_from_response(f"```{full_path.suffix.strip('.')}\n{generated_code}\n```")
             final_code = code_blocks[0]['code'] if code_blocks else generated_code
 
-            await file_logic.save_code(session, str(full_path), final_code)
+            if not await file_logic.save_code(session, str(full_path), final_code):
+                progress.update(p_task_id, description=f"[red]✗ FAILED {file_path_str}[/red]", completed=1)
+                return False
             progress.update(p_task_id, description=f"[green]✓ Wrote {file_path_str}[/green]", completed=1)
             return True
         except Exception as e:
@@ -312,7 +307,7 @@ async def github_create_repo_non_interactive(session, repo_name: str, descriptio
     console.print(f"Ensuring GitHub repo exists: [italic]{repo_name}[/italic]...")
     try:
         with console.status(f"[cyan]Checking/creating GitHub repository...[/cyan]", spinner="bouncingBall", spinner_style="cyan"):
-            service = GitHubService(session.config)
+            service = session.github_service
             repo = await service.get_or_create_repo(repo_name, is_private, description)
         if repo:
             session.repo_clone_url = repo.clone_url
@@ -325,7 +320,7 @@ async def github_create_repo_non_interactive(session, repo_name: str, descriptio
 async def setup_git_and_push(session, commit_message: str, repo_name: str, branch: str = "main") -> bool:
     """A high-level tool that performs the entire initial Git setup and push sequence."""
     console.print(f"Starting full Git and GitHub setup for [italic]{repo_name}[/italic]...")
-    git_utils = GitUtils()
+    git_utils = session.git_utils
     work_dir = session.work_dir
 
     with console.status(f"[cyan]Initializing Git repository...[/cyan]", spinner="bouncingBall", spinner_style="cyan"):
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
@@ -25,17 +26,17 @@ async def optimize_file(session, filename: str):
         
         request = CodeRequest(prompt=prompt, files={filename: content})
         
-        optimized_code = ""
+        chunks = []
         try:
             with console.status(f"[cyan]Optimizing file: {filename}...[/cyan]", spinner="point", spinner_style="cyan"):
                 async with AIService(session.config) as ai_service:
                     async for chunk in ai_service.stream_generate(request):
-                        optimized_code += chunk
+                        chunks.append(chunk)
         except KeyboardInterrupt:
             console.print("\n[yellow]Optimization cancelled by user.[/yellow]")
             return None
         
-        return optimized_code
+        return "".join(chunks)
         
     except FileNotFoundError:
         console.print(f"[red]Error: File not found at '{filename}'[/red]")
@@ -49,8 +50,8 @@ async def scan_repository(session):
     console.print("[cyan]Scanning repository for potential improvements...[/cyan]")
     
     # --- FIX: Load fresh, complete repository context to ensure scan is accurate ---
-    repo_path = Path.cwd()
-    all_files_content = build_repo_context(repo_path, session.config)
+    repo_path = session.config.work_dir
+    all_files_content = await asyncio.to_thread(build_repo_context, repo_path, session.config)
 
     if not all_files_content:
         console.print("[yellow]No files found in the repository to scan.[/yellow]")
@@ -69,14 +70,15 @@ async def scan_repository(session):
     # Pass all file content as a single "repository_context" file to the AI
     request = CodeRequest(prompt=prompt, files={"repository_context": file_contents_str})
     
-    report = ""
+    chunks = []
     try:
         with console.status("[bold yellow]AI is reviewing your code...[/bold yellow]", spinner="point", spinner_style="yellow"):
             async with AIService(session.config) as ai_service:
                 async for chunk in ai_service.stream_generate(request):
-                    report += chunk
+                    chunks.append(chunk)
     except KeyboardInterrupt:
         console.print("\n[yellow]Repository scan cancelled by user.[/yellow]")
         return
+    report = "".join(chunks)
                 
     console.print(Panel(Syntax(report, "markdown", theme="github-dark"), title="Repository Scan Report", border_style="blue"))
\ No newline at end of file
@@ -1,52 +1,65 @@
+import asyncio
+import os
 from pathlib import Path
 from rich.console import Console
+from rich.table import Table
 
 from ..utils.parsing_utils import extract_file_content_from_response
 
 console = Console()
 
-'''
-async def new_file(file_path_str: str, current_files: dict):
-    """Logic to create a new empty file."""
-    if not file_path_str:
-        return console.print("[red]Usage: /new <filename>[/red]")
-    path = Path(file_path_str)
-    if path.exists():
-        return console.print(f"[yellow]File already exists: {file_path_str}[/yellow]")
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.touch()
-        relative_path_str = str(path.relative_to(Path.cwd()))
-        current_files[relative_path_str] = ""
-        console.print(f"[green]✓ Created new file and added to context: {relative_path_str}[/green]")
-    except Exception as e:
-        console.print(f"[red]Error creating file: {e}[/red]")
+def _response_blocks(session, limit=None):
+    """
+    Returns the parsed file blocks of the last AI response, parsing it at most once.
+    A limited parse stops early and is not cached, since it may be incomplete.
+    """
+    content = session.last_ai_response_content
+    cached = session._parsed_blocks_cache
+    if cached is not None and cached[0] is content:
+        return cached[1]
+    if limit is not None:
+        return extract_file_content_from_response(content, limit=limit)
+    blocks = extract_file_content_from_response(content)
+    session._parsed_blocks_cache = (content, blocks)
+    return blocks
 
-async def save_code(session, filename: str):
-    """Logic to save the last code block to a file."""
-    if not filename:
-        return console.print("[red]Usage: /save <filename>[/red]")
-    if not session.last_ai_response_content:
-        return console.print("[red]No AI response available to save from.[/red]")
+def _existing_flags(paths):
+    """
+    Returns whether each path exists. Paths sharing a parent directory are
+    answered from a single scandir of that directory instead of one stat each;
+    only names the listing does not contain are stat'ed.
+    """
+    by_parent = {}
+    for index, path in enumerate(paths):
+        by_parent.setdefault(path.parent, []).append(index)
 
-    code_blocks = extract_file_content_from_response(session.last_ai_response_content)
-    if not code_blocks:
-        return console.print("[red]No code blocks found in the last AI response.[/red]")
+    flags = [False] * len(paths)
+    for parent, indexes in by_parent.items():
+        if len(indexes) == 1:
+            flags[indexes[0]] = os.path.exists(paths[indexes[0]])
+            continue
+        try:
+            with os.scandir(parent) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+        for index in indexes:
+            # An exact-name miss may still exist on a case-insensitive filesystem
+            # (readme.md vs README.md), so confirm misses with a real lookup.
+            flags[index] = paths[index].name in names or os.path.exists(paths[index])
+    return flags
 
-    code_to_save = code_blocks[0]['code']
-    path = Path.cwd().joinpath(filename)
-    action_verb = "Updated" if path.exists() else "Created"
-    
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        await session.file_service.write_file(path, code_to_save)
-        console.print(f"[green]✓ {action_verb} file: {filename}[/green]")
-        relative_path_str = str(path.relative_to(Path.cwd()))
-        session.current_files[relative_path_str] = code_to_save
-        console.print(f"[green]✓ {relative_path_str} is now in the active context.[/green]")
-    except Exception as e:
-        console.print(f"[red]Error saving file: {e}[/red]")
-'''
+async def _ensure_dirs(paths):
+    """Creates the unique parent directories of the given paths, once each."""
+    parents = {path.parent for path in paths}
+    await asyncio.gather(
+        *(asyncio.to_thread(parent.mkdir, parents=True, exist_ok=True) for parent in parents),
+        return_exceptions=True,
+    )
+
+def _within_project(session, path):
+    """Returns whether path stays inside the project once '..' segments are folded away."""
+    return os.path.normpath(path).startswith(session.file_service.work_dir_prefix)
 
 async def new_file(session, file_path_str: str):
     """Logic to create a new empty file using the centralized FileService."""
@@ -73,19 +86,24 @@ async def new_file(session, file_path_str: str):
         # Use work_dir as base
         path = session.file_service.work_dir.joinpath(filename)
 
+    # Security check before any directory is created on the way to the file.
+    if not _within_project(session, path):
+        console.print(f"[red]Security Error: Attempted to write outside project directory: '{file_path_str}'.[/red]")
+        return False
+
     if path.exists():
         console.print(f"[yellow]File already exists: {path.relative_to(session.file_service.work_dir)}[/yellow]")
         return True
 
     try:
         # Create parent directories if they don't exist
-        path.parent.mkdir(parents=True, exist_ok=True)
+        await _ensure_dirs([path])
         
         # Use the file_service to handle the write operation
-        await session.file_service.write_file(path, "")
+        await session.file_service.write_file(path, "", make_parents=False)
         
         relative_path_str = str(path.relative_to(session.file_service.work_dir))
-        session.current_files[relative_path_str] = ""
+        session.set_context_file(relative_path_str, "")
         console.print(f"[green]✓ Created new file and added to context: {relative_path_str}[/green]")
         return True
     except Exception as e:
@@ -105,7 +123,7 @@ async def save_code(session, file_path_str: str, code_to_save: str = None):
             console.print("[red]No AI response available to save from.[/red]")
             return False
             
-        code_blocks = extract_file_content_from_response(session.last_ai_response_content)
+        code_blocks = _response_blocks(session, limit=1)
         
         # --- FIX FOR ISSUE #2 ---
         # If no code blocks are found, assume the entire response is the file content.
@@ -117,14 +135,18 @@ async def save_code(session, file_path_str: str, code_to_save: str = None):
             # Default to saving the first code block if some are found.
             code_to_save = code_blocks[0]['code']
 
-    # The path is now a full path string provided by the caller
-    path = Path(file_path_str)
+    # Relative names are resolved against the project root; absolute paths pass through.
+    path = session.config.work_dir.joinpath(file_path_str)
+    if not _within_project(session, path):
+        console.print(f"[red]Security Error: Attempted to write outside project directory: '{file_path_str}'.[/red]")
+        return False
     
     try:
-        await session.file_service.write_file(path, code_to_save)
+        await _ensure_dirs([path])
+        await session.file_service.write_file(path, code_to_save, make_parents=False)
         relative_path_str = str(path.relative_to(session.config.work_dir))
         console.print(f"[green]✓ Saved changes to {relative_path_str}[/green]")
-        session.current_files[relative_path_str] = code_to_save
+        session.set_context_file(relative_path_str, code_to_save)
         return True
     except Exception as e:
         console.print(f"[red]Error saving file: {e}[/red]")
@@ -135,32 +157,54 @@ async def apply_changes(session):
     if not session.last_ai_response_content:
         return console.print("[red]No AI response available to apply changes from.[/red]")
 
-    code_blocks = [b for b in extract_file_content_from_response(session.last_ai_response_content) if b.get('filename')]
+    code_blocks = [b for b in _response_blocks(session) if b.get('filename')]
     if not code_blocks:
         return console.print("[yellow]No code blocks with file paths found in the response.[/yellow]")
 
+    cwd = session.config.work_dir
+    # Resolve each target once; the preview and the write pass below share these paths.
+    targets = [(block, cwd.joinpath(block['filename'])) for block in code_blocks]
+
     console.print("\n[bold]The following file changes will be applied:[/bold]")
-    for block in code_blocks:
-        status = "[yellow]new file[/yellow]" if not Path.cwd().joinpath(block['filename']).exists() else "[cyan]overwrite[/cyan]"
-        console.print(f"  - {block['filename']} ({status})")
+    preview = Table(show_header=False, box=None, padding=(0, 1, 0, 2))
+    existing = _existing_flags([path for _, path in targets])
+    for (block, _), exists in zip(targets, existing):
+        status = "[yellow]new file[/yellow]" if not exists else "[cyan]overwrite[/cyan]"
+        preview.add_row(f"- {block['filename']}", status)
+    console.print(preview)
     
     console.print("-" * 20)
-    applied_files = []
-    for block in code_blocks:
+    # Validate every target first, then write them all concurrently.
+    # Status lines are collected and printed in one go once the writes finish.
+    plan = []
+    status_lines = []
+    cwd_prefix = session.file_service.work_dir_prefix
+    for block, path in targets:
         filename, code = block['filename'], block['code']
-        path = Path.cwd().joinpath(filename)
-        try:
-            path.relative_to(Path.cwd()) # Security check
-            path.parent.mkdir(parents=True, exist_ok=True)
-            await session.file_service.write_file(path, code)
-            relative_path_str = str(path.relative_to(Path.cwd()))
-            session.current_files[relative_path_str] = code
-            console.print(f"[green]✓ Applied changes to {filename}[/green]")
-            applied_files.append(filename)
-        except ValueError:
-            console.print(f"[red]Security Error: Attempted to write outside project directory: '{path}'. Skipping.[/red]")
-        except Exception as e:
-            console.print(f"[red]Error applying changes to {filename}: {e}[/red]")
+        # Security check: normpath folds away '..' so the prefix test catches escapes,
+        # and the remainder is the relative key.
+        normalized = os.path.normpath(path)
+        if not normalized.startswith(cwd_prefix):
+            status_lines.append(f"[red]Security Error: Attempted to write outside project directory: '{path}'. Skipping.[/red]")
+            continue
+        plan.append((filename, Path(normalized), normalized[len(cwd_prefix):], code))
+
+    # A failed mkdir surfaces as a write error for the affected files below.
+    await _ensure_dirs(path for _, path, _, _ in plan)
+    results = await asyncio.gather(
+        *(session.file_service.write_file(path, code, make_parents=False) for _, path, _, code in plan),
+        return_exceptions=True,
+    )
+
+    applied_files = []
+    for (filename, path, relative_path_str, code), result in zip(plan, results):
+        if isinstance(result, Exception):
+            status_lines.append(f"[red]Error applying changes to {filename}: {result}[/red]")
+            continue
+        session.set_context_file(relative_path_str, code)
+        status_lines.append(f"[green]✓ Applied changes to {filename}[/green]")
+        applied_files.append(filename)
     
     if applied_files:
-        console.print("\n[green]✓ All detected changes have been applied.[/green]")
\ No newline at end of file
+        status_lines.append("\n[green]✓ All detected changes have been applied.[/green]")
+    console.print("\n".join(status_lines))
\ No newline at end of file
@@ -3,32 +3,43 @@ from rich.syntax import Syntax
 from rich.panel import Panel
 from rich.text import Text
 
-from pathlib import Path
+import asyncio
+import os
 import questionary
 
-from ..utils.git_utils import GitUtils
 from ..core.exceptions import NotAGitRepositoryError
 
 console = Console()
 
-async def add(files: list[str]):
+async def add(session, files: list[str]):
     """Logic to stage files."""
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     if not await git_utils.is_git_repo(repo_path):
         console.print("[red]Not a git repository.[/red]")
         return False
     if not files:
         console.print("[red]Usage: /git_add <file1> <file2>...[/red]")
         return False
-    await git_utils.add_files(repo_path, files)
-    console.print(f"[green]✓ Staged: {', '.join(files)}[/green]")
+    # One bad pathspec makes git reject the whole batch, so drop missing paths first.
+    # The stats run concurrently, which helps on slow or network filesystems.
+    found = await asyncio.gather(*(asyncio.to_thread(os.path.exists, repo_path / f) for f in files))
+    existing = [f for f, ok in zip(files, found) if ok]
+    missing = [f for f, ok in zip(files, found) if not ok]
+    if missing:
+        console.print(f"[yellow]Skipping missing paths: {', '.join(missing)}[/yellow]")
+    if not existing:
+        return False
+    if not await git_utils.add_files(repo_path, existing):
+        console.print(f"[red]Failed to stage: {', '.join(existing)}[/red]")
+        return False
+    console.print(f"[green]✓ Staged: {', '.join(existing)}[/green]")
     return True
 
-async def commit(message: str):
+async def commit(session, message: str):
     """Logic to commit staged changes."""
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     if not await git_utils.is_git_repo(repo_path):
         console.print("[red]Not a git repository.[/red]")
         return False
@@ -42,13 +53,13 @@ async def commit(message: str):
         console.print("[yellow]Nothing to commit.[/yellow]")
         return True # Not a failure state
 
-async def switch(branch_name: str = None, create: bool = False):
+async def switch(session, branch_name: str = None, create: bool = False):
     """
     Interactively switches to a local or remote branch.
     If branch_name is provided and fails, it falls back to the interactive selector.
     """
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     if not await git_utils.is_git_repo(repo_path):
         console.print("[red]Not a git repository.[/red]")
         return False
@@ -62,9 +73,12 @@ async def switch(branch_name: str = None, create: bool = False):
     
     try:
         with console.status("[dim]Fetching available branches...[/dim]", spinner="bouncingBall"):
-            local_branches = await git_utils.get_local_branches(repo_path)
-            remote_branches = await git_utils.get_all_branches(repo_path)
-            current_branch = await git_utils.get_current_branch(repo_path)
+            # Only the remote listing needs the fetch; local refs are read alongside it.
+            local_branches, remote_branches, current_branch = await asyncio.gather(
+                git_utils.get_local_branches(repo_path, fetch=False),
+                git_utils.get_all_branches(repo_path),
+                git_utils.get_current_branch(repo_path),
+            )
 
         all_branches = sorted(list(set(local_branches + remote_branches)))
         choices = [b for b in all_branches if b != current_branch]
@@ -94,10 +108,10 @@ async def switch(branch_name: str = None, create: bool = False):
         console.print(f"[red]An error occurred while trying to switch branches: {e}[/red]")
         return False
 
-async def pull():
+async def pull(session):
     """Logic to pull changes for the current branch."""
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     if not await git_utils.is_git_repo(repo_path):
         console.print("[red]Not a git repository.[/red]")
         return False
@@ -110,10 +124,10 @@ async def pull():
             console.print("[red]Pull failed. Check for conflicts or connection issues.[/red]")
             return False
 
-async def push():
+async def push(session):
     """Logic to push changes for the current branch."""
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     if not await git_utils.is_git_repo(repo_path):
         console.print("[red]Not a git repository.[/red]")
         return False
@@ -127,28 +141,32 @@ async def push():
             console.print(f"[red]Push failed: {e}[/red]")
             return False
 
-async def log():
+async def log(session):
     """Logic to display the formatted git log."""
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     if not await git_utils.is_git_repo(repo_path):
         return console.print("[red]This is not a git repository.[/red]")
     
     log_output = await git_utils.get_formatted_log(repo_path)
     console.print(Panel(log_output, title="Recent Commits", border_style="blue"))
 
-async def review_and_commit(show_diff: bool = False) -> tuple[bool, str]:
+async def review_and_commit(session, show_diff: bool = False) -> tuple[bool, str]:
     """
     Handles reviewing and committing.
     Returns a tuple: (commit_successful, committed_branch_name)
     """
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
     try:
         if not await git_utils.is_git_repo(repo_path):
             raise NotAGitRepositoryError(path=repo_path)
 
-        unstaged = await git_utils.get_unstaged_files(repo_path)
+        # The branch cannot change during the review, so look it up alongside the status.
+        unstaged, current_branch = await asyncio.gather(
+            git_utils.get_unstaged_files(repo_path),
+            git_utils.get_current_branch(repo_path),
+        )
         if unstaged:
             unstaged_list = "\n".join([f"  • {f}" for f in unstaged])
             console.print(Panel(
@@ -190,7 +208,6 @@ async def review_and_commit(show_diff: bool = False) -> tuple[bool, str]:
             return False, ""
 
         await git_utils.commit(repo_path, commit_message)
-        current_branch = await git_utils.get_current_branch(repo_path)
         console.print(f"[green]✓ Changes committed to branch '{current_branch}'.[/green]")
         return True, current_branch
     except NotAGitRepositoryError as e:
@@ -1,4 +1,4 @@
-from pathlib import Path
+import asyncio
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -8,7 +8,6 @@ from typing import List, Optional
 import os
 
 from ..services.github_service import GitHubService
-from ..utils.git_utils import GitUtils
 from ..core.exceptions import GitHubServiceError, NotAGitRepositoryError
 
 console = Console()
@@ -31,7 +30,7 @@ async def ensure_github_credentials(session):
     
     # Re-initialize the service with the new token
     try:
-        session.github_service = GitHubService(session.config)
+        session.github_service = GitHubService(session.config, git_utils=session.git_utils)
         console.print(f"[green]✓ Authenticated with GitHub as {session.github_service.user.login}.[/green]")
         return True
     except Exception as e:
@@ -42,13 +41,17 @@ async def ensure_github_credentials(session):
 async def create_repo(session):
     """Logic to interactively create a new GitHub repository."""
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         console.print("\n[bold cyan]Creating a new GitHub Repository...[/bold cyan]")
         
-        repo_name = await questionary.text("Repository Name:").ask_async()
+        answers = await questionary.form(
+            repo_name=questionary.text("Repository Name:"),
+            description=questionary.text("Description (optional):"),
+            is_private=questionary.confirm("Make repository private?", default=True, auto_enter=False),
+        ).ask_async()
+        repo_name = answers.get("repo_name")
         if not repo_name: return console.print("[red]Repository name cannot be empty.[/red]")
-        description = await questionary.text("Description (optional):").ask_async()
-        is_private = await questionary.confirm("Make repository private?", default=True, auto_enter=False).ask_async()
+        description, is_private = answers["description"], answers["is_private"]
 
         with console.status(f"Creating repository '{repo_name}' on GitHub...", spinner="bouncingBall"):
             clone_url = await service.create_repo(repo_name, is_private, description)
@@ -60,12 +63,16 @@ async def create_repo(session):
 async def create_branch(session):
     """Logic to interactively create a new GitHub branch (on remote)."""
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         console.print("\n[bold cyan]Creating a new GitHub Branch...[/bold cyan]")
 
-        branch_name = await questionary.text("New Branch Name:").ask_async()
+        answers = await questionary.form(
+            branch_name=questionary.text("New Branch Name:"),
+            source_branch=questionary.text("Source Branch on remote:", default="main"),
+        ).ask_async()
+        branch_name = answers.get("branch_name")
         if not branch_name: return console.print("[red]Branch name cannot be empty.[/red]")
-        source_branch = await questionary.text("Source Branch on remote:", default="main").ask_async()
+        source_branch = answers["source_branch"]
 
         with console.status(f"Creating remote branch '{branch_name}' from '{source_branch}'...", spinner="bouncingBall"):
             await service.create_branch(branch_name, source_branch)
@@ -75,23 +82,45 @@ async def create_branch(session):
 async def create_issue(session):
     """Logic to interactively create a GitHub issue."""
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         console.print("\n[bold cyan]Creating a new GitHub Issue...[/bold cyan]")
         
-        title = await questionary.text("Issue Title:").ask_async()
+        answers = await questionary.form(
+            title=questionary.text("Issue Title:"),
+            body=questionary.text("Issue Body (optional, markdown supported):"),
+        ).ask_async()
+        title = answers.get("title")
         if not title: return console.print("[red]Title cannot be empty.[/red]")
-        body = await questionary.text("Issue Body (optional, markdown supported):").ask_async()
+        body = answers["body"]
         
         with console.status(f"Creating issue: '{title}'...", spinner="bouncingBall"):
             await service.create_issue(title, body)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
         console.print(f"[red]Error: {e}[/red]")
 
-async def interactive_pr_creation(session):
-    """Full interactive flow for creating a PR."""
-    service = GitHubService(session.config)
-    git_utils = GitUtils()
-    repo_path = Path.cwd()
+async def finish_push(push_task, branch_name: str) -> bool:
+    """Waits for a background push, showing a spinner only if it is still running."""
+    try:
+        if push_task.done():
+            await push_task
+        else:
+            with console.status(f"Pushing '{branch_name}'...", spinner="bouncingBall"):
+                await push_task
+    except Exception as e:
+        console.print(f"[red]Push failed: {e}[/red]")
+        return False
+    console.print(f"[green]✓ Branch '{branch_name}' pushed successfully.[/green]")
+    return True
+
+async def interactive_pr_creation(session, pending_push=None):
+    """
+    Full interactive flow for creating a PR.
+    pending_push is an optional (branch_name, task) for a push already in flight.
+    """
+    service = session.github_service
+    git_utils = session.git_utils
+    repo_path = session.config.work_dir
+    pushed_branch, push_task = pending_push or (None, None)
     try:
         if not await git_utils.is_git_repo(repo_path): raise NotAGitRepositoryError(path=repo_path)
         console.print("\n[bold cyan]Creating a new Pull Request...[/bold cyan]")
@@ -130,7 +159,7 @@ async def interactive_pr_creation(session):
             head_branch = current_branch
             console.print(f"[green]✓ Using current branch '{head_branch}' as PR source.[/green]")
         else:  # "Switch to different branch"
-            local_branches = await git_utils.get_local_branches(repo_path)
+            local_branches = await git_utils.get_local_branches(repo_path, fetch=False)
             other_branches = [b for b in local_branches if b != current_branch]
             if not other_branches:
                 console.print("[yellow]No other branches available. Using current branch.[/yellow]")
@@ -143,31 +172,46 @@ async def interactive_pr_creation(session):
                 await git_utils.switch_branch(repo_path, head_branch)
                 console.print(f"[green]✓ Switched to branch '{head_branch}' for PR.[/green]")
         
-        with console.status(f"[yellow]Pushing '{head_branch}' to remote...[/yellow]", spinner="bouncingBall", spinner_style="yellow"):
-            await git_utils.push(repo_path, head_branch, set_upstream=True)
+        if push_task is None or pushed_branch != head_branch:
+            if push_task is not None:
+                await finish_push(push_task, pushed_branch)
+            # Let the push run while the user fills in the PR details.
+            pushed_branch = head_branch
+            push_task = asyncio.create_task(git_utils.push(repo_path, head_branch, set_upstream=True))
 
-        title = await questionary.text("PR Title:").ask_async()
+        answers = await questionary.form(
+            title=questionary.text("PR Title:"),
+            body=questionary.text("PR Body (optional):"),
+            base=questionary.text("Target branch:", default="main"),
+        ).ask_async()
+        title = answers.get("title")
         if not title: 
             console.print("[red]Title cannot be empty. Aborting PR creation.[/red]")
             return
-            
-        body = await questionary.text("PR Body (optional):").ask_async()
-        base = await questionary.text("Target branch:", default="main").ask_async()
+        body, base = answers["body"], answers["base"]
         
         if head_branch == base:
             console.print(f"[red]Error: Cannot create PR from '{head_branch}' to '{base}' (same branch)[/red]")
             return
         
+        pending, push_task = push_task, None
+        if not await finish_push(pending, head_branch):
+            return
+
         console.print(f"[cyan]Creating PR: {head_branch} → {base}[/cyan]")
         with console.status("Creating Pull Request...", spinner="bouncingBall"):
             await service.create_pull_request(title, body, head_branch, base)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
         console.print(f"[red]Error creating PR: {e}[/red]")
+    finally:
+        # Never leave a push running unobserved when the flow exits early.
+        if push_task is not None:
+            await finish_push(push_task, pushed_branch)
 
 async def repo_summary(session):
     """Logic to get AI summary of the repo."""
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         with console.status("[dim][bold cyan]Generating AI repository summary...[/bold cyan][/dim]", spinner="bouncingBall", spinner_style="[dim]cyan[/dim]"):
             summary = await service.get_ai_repo_summary()
         markdown_content = Markdown(summary)
@@ -186,7 +230,7 @@ async def pr_review(session, pr_number_str: str):
         return console.print("[red]Usage: /pr_review <pr_number>[/red]")
     pr_number = int(pr_number_str)
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         with console.status(f"[dim][cyan]Generating AI review...[/cyan][/dim]", spinner="bouncingBall", spinner_style="[dim]cyan[/dim]"):
             summary = await service.get_ai_pr_summary(pr_number)
         
@@ -206,7 +250,7 @@ async def approve_pr(session, pr_number_str: str):
         return console.print("[red]Usage: /pr_approve <pr_number>[/red]")
     pr_number = int(pr_number_str)
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         with console.status(f"Approving PR #{pr_number}...", spinner="bouncingBall"):
             await service.approve_pr(pr_number)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
@@ -221,7 +265,7 @@ async def comment_on_pr(session, pr_number_str: str):
         comment = await questionary.text("Enter your comment (markdown supported):").ask_async()
         if not comment:
             return console.print("[yellow]Comment cancelled.[/yellow]")
-        service = GitHubService(session.config)
+        service = session.github_service
         with console.status(f"Posting comment to PR #{pr_number}...", spinner="bouncingBall"):
             await service.comment_on_pr(pr_number, comment)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
@@ -239,7 +283,7 @@ async def merge_pr(session, pr_number_str: str):
             default="merge"
         ).ask_async()
         
-        service = GitHubService(session.config)
+        service = session.github_service
         with console.status(f"Merging PR #{pr_number}...", spinner="bouncingBall"):
             await service.merge_pr(pr_number, method)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
@@ -248,7 +292,7 @@ async def merge_pr(session, pr_number_str: str):
 async def list_issues(session, assignee_filter: Optional[str]):
     """Logic to list open issues with a smart default filter."""
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         
         if assignee_filter is None:
             assignee_filter = '*'
@@ -285,7 +329,7 @@ async def list_issues(session, assignee_filter: Optional[str]):
 async def list_prs(session):
     """Logic to list open pull requests."""
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         with console.status("Fetching open pull requests...", spinner="bouncingBall"):
             prs = await service.get_open_prs()
 
@@ -309,7 +353,7 @@ async def close_issue(session, issue_number_str: str, comment: str):
     if not issue_number_str or not issue_number_str.isdigit():
         return console.print("[red]Usage: /issue_close <number> [comment...][/red]")
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         await service.close_issue(int(issue_number_str), comment)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -318,7 +362,7 @@ async def comment_on_issue(session, issue_number_str: str, comment: str):
     if not issue_number_str or not issue_number_str.isdigit():
         return console.print("[red]Usage: /issue_comment <number> <comment...>[/red]")
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         await service.comment_on_issue(int(issue_number_str), comment)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -327,7 +371,7 @@ async def assign_issue(session, issue_number_str: str, assignee: str):
     if not issue_number_str or not issue_number_str.isdigit() or not assignee:
         return console.print("[red]Usage: /issue_assign <number> <username>[/red]")
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         await service.assign_issue(int(issue_number_str), assignee)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -336,7 +380,7 @@ async def link_pr_to_issue(session, pr_number_str: str, issue_number_str: str):
     if not pr_number_str or not pr_number_str.isdigit() or not issue_number_str or not issue_number_str.isdigit():
         return console.print("[red]Usage: /pr_link_issue <pr_number> <issue_number>[/red]")
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         await service.link_pr_to_issue(int(pr_number_str), int(issue_number_str))
     except (GitHubServiceError, NotAGitRepositoryError) as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -345,7 +389,7 @@ async def request_pr_reviewers(session, pr_number_str: str, reviewers: List[str]
     if not pr_number_str or not pr_number_str.isdigit() or not reviewers:
         return console.print("[red]Usage: /pr_request_review <pr_number> <user1> [user2]...[/red]")
     try:
-        service = GitHubService(session.config)
+        service = session.github_service
         await service.request_pr_reviewers(int(pr_number_str), reviewers)
     except (GitHubServiceError, NotAGitRepositoryError) as e:
         console.print(f"[red]Error: {e}[/red]")
\ No newline at end of file
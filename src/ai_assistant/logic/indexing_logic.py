@@ -1,3 +1,4 @@
+import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
@@ -10,19 +11,20 @@ from ..core.config import Config
 console = Console()
 LOG_FILE = Path(".helios/log.json")
 
-def _read_log():
-    """Reads the log file, creating it if it doesn't exist."""
-    if not LOG_FILE.exists():
-        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(LOG_FILE, 'w') as f:
+def _read_log(config: Config):
+    """Reads the project's log file, creating it if it doesn't exist."""
+    log_file = config.work_dir / LOG_FILE
+    if not log_file.exists():
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_file, 'w') as f:
             json.dump({}, f)
         return {}
-    with open(LOG_FILE, 'r') as f:
+    with open(log_file, 'r') as f:
         return json.load(f)
 
-def _write_log(data: dict):
-    """Writes data to the log file."""
-    with open(LOG_FILE, 'w') as f:
+def _write_log(config: Config, data: dict):
+    """Writes data to the project's log file."""
+    with open(config.work_dir / LOG_FILE, 'w') as f:
         json.dump(data, f, indent=4)
 
 async def run_indexing(config: Config) -> dict:
@@ -31,8 +33,8 @@ async def run_indexing(config: Config) -> dict:
     and returns the file context.
     """
     try:
-        repo_path = Path.cwd()
-        file_contents = build_repo_context(repo_path, config)
+        repo_path = config.work_dir
+        file_contents = await asyncio.to_thread(build_repo_context, repo_path, config)
         if not file_contents:
             console.print("[yellow]No supported files found to index.[/yellow]")
             return {}
@@ -40,12 +42,13 @@ async def run_indexing(config: Config) -> dict:
 
         with console.status(f"[cyan]Indexing {len(file_contents)} files...[/cyan]", spinner="dots"):
             vector_store = VectorStore(config)
-            vector_store.index_files(file_contents)
+            # Chunking and embedding are CPU-bound; keep the event loop free while they run.
+            await asyncio.to_thread(vector_store.index_files, file_contents)
             
             # Log the successful index
-            log_data = _read_log()
+            log_data = _read_log(config)
             log_data['last_indexed'] = datetime.now().isoformat()
-            _write_log(log_data)
+            _write_log(config, log_data)
         
         console.print(f"[green]✓ Indexed {len(file_contents)} files successfully[/green]")
         return file_contents
@@ -55,7 +58,7 @@ async def run_indexing(config: Config) -> dict:
 
 async def check_and_run_startup_indexing(config: Config):
     """Checks if indexing is needed on startup and runs it if so."""
-    log_data = _read_log()
+    log_data = _read_log(config)
     last_indexed_str = log_data.get('last_indexed')
     
     needs_indexing = True
@@ -64,7 +67,7 @@ async def check_and_run_startup_indexing(config: Config):
         if last_indexed_date == datetime.now().date():
             needs_indexing = False
             console.print("[dim]Loading existing index...[/dim]")
-            return build_repo_context(Path.cwd(), config)
+            return await asyncio.to_thread(build_repo_context, config.work_dir, config)
 
     if needs_indexing:
         return await run_indexing(config)
\ No newline at end of file
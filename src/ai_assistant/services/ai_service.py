@@ -1,13 +1,42 @@
 import asyncio
 import json
-import aiohttp
+from itertools import islice
 from typing import Optional, AsyncGenerator, List, Dict
 
+import aiohttp
+
 from ..core.config import Config
 from ..core.exceptions import AIServiceError
 from ..models.request import CodeRequest
 from ..utils.parsing_utils import build_file_tree
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+def _strip_thinking(text: str) -> str:
+    """Removes <Thinking>...</Thinking> blocks; an unclosed block runs to the end of the text."""
+    parts = []
+    pos = 0
+    while True:
+        start = text.find("<Thinking>", pos)
+        if start == -1:
+            parts.append(text[pos:])
+            break
+        parts.append(text[pos:start])
+        end = text.find("</Thinking>", start)
+        if end == -1:
+            break
+        pos = end + len("</Thinking>")
+    return "".join(parts)
+
+
+# Chat turns are often further apart than aiohttp's default 15s keep-alive.
+KEEPALIVE_SECONDS = 120
+
 
 class AIService:
     """Service for interacting with local AI models via the /api/chat endpoint."""
@@ -18,15 +47,24 @@ class AIService:
         self.session: Optional[aiohttp.ClientSession] = None
 
     async def __aenter__(self):
-        # Increased timeout for potentially long AI operations like reviews
-        timeout = aiohttp.ClientTimeout(total=self.model_config.timeout)
-        self.session = aiohttp.ClientSession(timeout=timeout)
-        return self
+        return await self.open()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def open(self):
+        """Opens the HTTP session. A long-lived service keeps its connections alive between requests."""
+        if not self.session or self.session.closed:
+            # Increased timeout for potentially long AI operations like reviews
+            timeout = aiohttp.ClientTimeout(total=self.model_config.timeout)
+            connector = aiohttp.TCPConnector(keepalive_timeout=KEEPALIVE_SECONDS)
+            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+        return self
+
+    async def close(self):
         if self.session and not self.session.closed:
             await self.session.close()
-            self.session = None
+        self.session = None
 
     def _build_chat_messages(self, request: CodeRequest) -> List[Dict[str, str]]:
         """
@@ -44,10 +82,11 @@ class AIService:
             user_prompt_parts.append("This is the file structure of the project for your reference:")
             user_prompt_parts.append(f"--- REPOSITORY FILE TREE ---\n{tree_str}\n--- END REPOSITORY FILE TREE ---")
 
-        history_to_include = request.conversation_history[:-1]
-        if history_to_include:
+        # Everything but the current request, read in place rather than sliced into a new list.
+        history = request.conversation_history
+        if len(history) > 1:
             user_prompt_parts.append("\n--- Previous Conversation ---")
-            for turn in history_to_include:
+            for turn in islice(history, len(history) - 1):
                 user_prompt_parts.append(f"{turn['role'].capitalize()}: {turn['content']}")
             user_prompt_parts.append("--- End of Previous Conversation ---")
 
@@ -64,25 +103,61 @@ class AIService:
 
         return messages
 
+    def _build_payload(self, request: CodeRequest, stream: bool) -> dict:
+        """Builds the /api/chat request body for the current model."""
+        return {
+            "model": self.model_config.name,
+            "messages": self._build_chat_messages(request),
+            "stream": stream,
+            "options": {
+                "temperature": self.model_config.temperature,
+                "num_ctx": self.model_config.context_length,
+                "num_predict": self.model_config.max_tokens,
+            }
+        }
+
+    async def generate(self, request: CodeRequest, timeout: Optional[float] = None) -> str:
+        """
+        Returns a complete response in one round trip, without <Thinking>...</Thinking> content.
+        Suited to short answers the caller only uses once they are finished.
+        """
+        self.model_config = self.config.get_current_model()
+        if self.model_config.type != 'ollama':
+            raise AIServiceError(f"Unsupported model type: {self.model_config.type}")
+
+        if not self.session or self.session.closed:
+            raise AIServiceError("AIOHTTP session is not active.")
+
+        payload = self._build_payload(request, stream=False)
+        url = f"{self.model_config.endpoint}/api/chat"
+
+        try:
+            request_timeout = aiohttp.ClientTimeout(total=timeout or self.model_config.timeout)
+            async with self.session.post(url, json=payload, timeout=request_timeout) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise AIServiceError(f"Ollama API error ({response.status}): {error_text}")
+                data = _loads(await response.read())
+        except asyncio.TimeoutError:
+            raise AIServiceError("Request to Ollama timed out. The model may be taking too long to respond.")
+        except aiohttp.ClientError as e:
+            raise AIServiceError(f"Connection error to Ollama at {url}: {e}")
+        except json.JSONDecodeError as e:
+            raise AIServiceError(f"Invalid response from Ollama: {e}")
+
+        return _strip_thinking(data.get('message', {}).get('content', ''))
+
     async def stream_generate(self, request: CodeRequest) -> AsyncGenerator[str, None]:
         """Streams a response, removing content within <Thinking>...</Thinking> tags."""
+        # A shared service outlives /model switches, so pick up the current model per request.
+        self.model_config = self.config.get_current_model()
         if self.model_config.type != 'ollama':
             raise AIServiceError(f"Unsupported streaming model type: {self.model_config.type}")
 
         if not self.session or self.session.closed:
             raise AIServiceError("AIOHTTP session is not active.")
 
-        messages = self._build_chat_messages(request)
-        payload = {
-            "model": self.model_config.name,
-            "messages": messages,
-            "stream": True,
-            "options": {
-                "temperature": self.model_config.temperature,
-                "num_ctx": self.model_config.context_length,
-                "num_predict": self.model_config.max_tokens,
-            }
-        }
+        payload = self._build_payload(request, stream=True)
         url = f"{self.model_config.endpoint}/api/chat"
         
         buffer = ""
@@ -91,7 +166,8 @@ class AIService:
         end_tag = "</Thinking>"
 
         try:
-            async with self.session.post(url, json=payload) as response:
+            timeout = aiohttp.ClientTimeout(total=self.model_config.timeout)
+            async with self.session.post(url, json=payload, timeout=timeout) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise AIServiceError(f"Ollama API error ({response.status}): {error_text}")
@@ -99,7 +175,7 @@ class AIService:
                 async for line in response.content:
                     if not line: continue
                     try:
-                        data = json.loads(line.decode('utf-8'))
+                        data = _loads(line)
                         if 'message' in data and 'content' in data['message']:
                             chunk = data['message']['content']
                             buffer += chunk
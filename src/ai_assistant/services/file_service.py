@@ -1,11 +1,15 @@
 import logging
+import os
 import aiofiles
 from pathlib import Path
+from typing import Iterable
 from ..core.config import Config
 from ..core.exceptions import FileServiceError
 
 logger = logging.getLogger(__name__)
 
+SMALL_FILE_BYTES = 64 * 1024
+
 class FileService:
     """Service for asynchronous file operations."""
     
@@ -13,6 +17,8 @@ class FileService:
         self.config = config
         # THE FIX: Work relative to the project root defined in config
         self.work_dir = config.work_dir
+        # String form with a trailing separator, for cheap containment checks and slicing.
+        self.work_dir_prefix = os.path.join(str(self.work_dir), '')
     
     async def read_file(self, file_path: Path | str) -> str:
         """Read file content asynchronously, with validation."""
@@ -24,18 +30,24 @@ class FileService:
             # Security check to prevent reading files outside the project directory
             full_path.relative_to(self.work_dir)
             
-            if not full_path.exists():
+            try:
+                size = full_path.stat().st_size
+            except FileNotFoundError:
                 raise FileNotFoundError(f"File not found: {full_path}")
             
-            if full_path.stat().st_size > self.config.max_file_size:
-                raise FileServiceError(f"File is too large: {full_path} ({full_path.stat().st_size} bytes)")
+            if size > self.config.max_file_size:
+                raise FileServiceError(f"File is too large: {full_path} ({size} bytes)")
             
             # Allow supported extensions or files with no extension (like Dockerfile)
             if full_path.suffix and full_path.suffix not in self.config.supported_extensions and full_path.name not in self.config.supported_extensions:
                  raise FileServiceError(f"Unsupported file type: {full_path.suffix}")
             
-            async with aiofiles.open(full_path, 'r', encoding='utf-8') as f:
-                content = await f.read()
+            if size < SMALL_FILE_BYTES:
+                # A small read finishes faster inline than a round trip through aiofiles' thread pool.
+                content = full_path.read_text(encoding='utf-8')
+            else:
+                async with aiofiles.open(full_path, 'r', encoding='utf-8') as f:
+                    content = await f.read()
             logger.debug(f"Successfully read file: {full_path}")
             return content
                 
@@ -50,13 +62,18 @@ class FileService:
                 raise FileServiceError(f"Error reading file {full_path}: {e}")
             raise e
 
-    async def write_file(self, file_path: Path, content: str):
-        """Write content to file asynchronously."""
+    async def write_file(self, file_path: Path, content: str, make_parents: bool = True):
+        """Write content to file asynchronously.
+
+        Callers that have already created the parent directory can pass
+        make_parents=False to skip the redundant mkdir.
+        """
         try:
             # Ensure we are writing within the project directory
             file_path.resolve().relative_to(self.work_dir)
 
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            if make_parents:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
             async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
                 await f.write(content)
             logger.info(f"Successfully wrote changes to file: {file_path}")
@@ -64,4 +81,31 @@ class FileService:
              raise FileServiceError(f"Security error: Attempted to write file outside of project directory: {file_path}")
         except Exception as e:
             logger.error(f"Error writing to file {file_path}: {e}")
-            raise FileServiceError(f"Error writing file {file_path}: {e}")
\ No newline at end of file
+            raise FileServiceError(f"Error writing file {file_path}: {e}")
+
+    async def write_segments(self, file_path: Path, segments: Iterable[str], chunk_size: int = 64 * 1024):
+        """Write an iterable of string pieces to a file without joining them first.
+
+        Pieces are grouped into chunks of roughly chunk_size characters so each
+        thread hop through aiofiles carries a useful amount of data.
+        """
+        try:
+            file_path.resolve().relative_to(self.work_dir)
+
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
+                pending, size = [], 0
+                for segment in segments:
+                    pending.append(segment)
+                    size += len(segment)
+                    if size >= chunk_size:
+                        await f.write("".join(pending))
+                        pending, size = [], 0
+                if pending:
+                    await f.write("".join(pending))
+            logger.info(f"Successfully wrote changes to file: {file_path}")
+        except ValueError:
+             raise FileServiceError(f"Security error: Attempted to write file outside of project directory: {file_path}")
+        except Exception as e:
+            logger.error(f"Error writing to file {file_path}: {e}")
+            raise FileServiceError(f"Error writing file {file_path}: {e}")
@@ -13,12 +13,15 @@ from ..utils.git_utils import GitUtils
 
 console = Console()
 
+# Per-file diff summaries are one sentence; give up on a file rather than stall the review.
+DIFF_SUMMARY_TIMEOUT = 60
+
 class GitHubService:
     """Service for interacting with the GitHub API using PyGithub."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, git_utils: Optional[GitUtils] = None):
         self.config = config
-        self.git_utils = GitUtils()
+        self.git_utils = git_utils or GitUtils()
         token = self.config.github.token or os.getenv("GITHUB_TOKEN")
         
         if not token:
@@ -45,7 +48,7 @@ class GitHubService:
         """
         Gets the local repository context using Git commands.
         """
-        repo_path = repo_path or Path.cwd()
+        repo_path = repo_path or self.config.work_dir
         context = {
             "is_git_repo": False,
             "current_branch": "unknown",
@@ -55,15 +58,17 @@ class GitHubService:
             if not await self.git_utils.is_git_repo(repo_path):
                 return context
             context["is_git_repo"] = True
-            context["current_branch"] = await self.git_utils.get_current_branch(repo_path)
-            context["status"] = await self.git_utils.get_status(repo_path)
+            context["current_branch"], context["status"] = await asyncio.gather(
+                self.git_utils.get_current_branch(repo_path),
+                self.git_utils.get_status(repo_path),
+            )
         except Exception as e:
             console.print(f"[yellow]Warning: Could not get full git context for {repo_path}: {e}[/yellow]")
         return context
 
     async def _get_repo_object(self):
         """Helper to get the PyGithub Repository object for the current directory."""
-        repo_path = Path.cwd()
+        repo_path = self.config.work_dir
         if not await self.git_utils.is_git_repo(repo_path):
             raise NotAGitRepositoryError(path=repo_path)
         
@@ -160,12 +165,9 @@ class GitHubService:
             f"Focus on the 'what' and 'why'.\n\n--- DIFF ---\n{patch}"
         )
         request = CodeRequest(prompt=prompt)
-        summary = ""
         try:
             async with AIService(self.config) as ai_service:
-                ai_service.session.timeout.total = 60 
-                async for chunk in ai_service.stream_generate(request):
-                    summary += chunk
+                summary = await ai_service.generate(request, timeout=DIFF_SUMMARY_TIMEOUT)
             return f"- **{filename}**: {summary.strip()}"
         except Exception:
             return f"- **{filename}**: Could not summarize (request may have timed out)."
@@ -201,10 +203,8 @@ class GitHubService:
             )
 
             request = CodeRequest(prompt=final_prompt)
-            final_review = ""
             async with AIService(self.config) as ai_service:
-                async for chunk in ai_service.stream_generate(request):
-                    final_review += chunk
+                final_review = await ai_service.generate(request)
             return final_review.strip()
 
         except UnknownObjectException:
@@ -212,16 +212,24 @@ class GitHubService:
         except Exception as e:
             raise GitHubServiceError(f"Failed to get PR summary: {e}")
 
+    @staticmethod
+    def _read_readme(repo) -> str:
+        """Downloads the repository README, blocking; run it in a worker thread."""
+        try:
+            return repo.get_readme().decoded_content.decode('utf-8')
+        except UnknownObjectException:
+            return "No README file found."
+
     async def get_ai_repo_summary(self) -> str:
         """Gets an AI-generated summary of the entire repository."""
         repo = await self._get_repo_object()
         try:
-            repo_context = await self.get_repository_context()
-            recent_commits = await self.git_utils.get_recent_commits(Path.cwd(), count=5)
-            try:
-                readme_content = repo.get_readme().decoded_content.decode('utf-8')
-            except UnknownObjectException:
-                readme_content = "No README file found."
+            # Local git context and the README download don't depend on each other.
+            repo_context, recent_commits, readme_content = await asyncio.gather(
+                self.get_repository_context(),
+                self.git_utils.get_recent_commits(self.config.work_dir, count=5),
+                asyncio.to_thread(self._read_readme, repo),
+            )
 
             prompt = (
                 f"Please provide a detailed 'about' summary for the repository '{repo.full_name}'.\n\n"
@@ -232,10 +240,8 @@ class GitHubService:
                 "Provide a clear, high-level overview."
             )
             request = CodeRequest(prompt=prompt)
-            summary = ""
             async with AIService(self.config) as ai_service:
-                async for chunk in ai_service.stream_generate(request):
-                    summary += chunk
+                summary = await ai_service.generate(request)
             return summary.strip()
         except Exception as e:
             raise GitHubServiceError(f"Failed to generate repository summary: {e}")
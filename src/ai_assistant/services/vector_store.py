@@ -1,5 +1,5 @@
 import pickle
-from pathlib import Path
+from collections import OrderedDict
 from typing import List, Dict, Any
 import os
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
@@ -17,17 +17,22 @@ class VectorStore:
     INDEX_FILE = ".helios/vector_index.faiss"
     METADATA_FILE = ".helios/metadata.pkl"
     EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+    SEARCH_CACHE_SIZE = 128
+    # Acknowledgements carry no meaning to search on.
+    TRIVIAL_QUERIES = frozenset({"y", "n", "yes", "no", "ok", "okay", "thanks", "continue", "go on"})
 
     def __init__(self, config: Config):
         self.config = config
-        self.index_path = Path(self.INDEX_FILE)
-        self.metadata_path = Path(self.METADATA_FILE)
+        self.index_path = config.work_dir / self.INDEX_FILE
+        self.metadata_path = config.work_dir / self.METADATA_FILE
         
         # --- THE FIX: LAZY LOADING ---
         # Initialize resources to None. They will be loaded on first use via properties.
         self._embedding_model: SentenceTransformer | None = None
         self._index: faiss.Index | None = None
         self._metadata: List[Dict[str, Any]] | None = None
+        # (normalized query, k) -> results, least recently used first.
+        self._search_cache: OrderedDict = OrderedDict()
 
     @property
     def embedding_model(self) -> SentenceTransformer:
@@ -87,6 +92,7 @@ class VectorStore:
         
         all_chunks_text = []
         self._metadata = [] # Reset metadata before re-indexing
+        self._search_cache.clear()
 
         for file_path, content in track(file_contents.items(), description="[dim][cyan]Chunking files...[/cyan][/dim]"):
             chunks = text_splitter.split_text(content)
@@ -112,6 +118,16 @@ class VectorStore:
 
     def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
         """Searches the vector store, triggering lazy loading if needed."""
+        normalized = " ".join(query.lower().split())
+        if not normalized or normalized in self.TRIVIAL_QUERIES:
+            return []
+
+        key = (normalized, k)
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            self._search_cache.move_to_end(key)
+            return list(cached)
+
         if self.index is None or not self.metadata:
             return []
 
@@ -120,11 +136,21 @@ class VectorStore:
         distances, indices = self.index.search(query_embedding, k)
         
         results = [self.metadata[i] for i in indices[0] if i != -1]
-        
-        return results
+
+        self._search_cache[key] = results
+        if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return list(results)
+
+    def reload(self):
+        """Drops the loaded index so the next search reads the one on disk."""
+        self._index = None
+        self._metadata = None
+        self._search_cache.clear()
     
     def clear(self):
         """Clears the vector store by resetting index and metadata."""
         self._index = None
         self._metadata = None
+        self._search_cache.clear()
         console.print("[dim]Vector store cleared.[/dim]")
\ No newline at end of file
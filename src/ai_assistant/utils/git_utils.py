@@ -6,10 +6,16 @@ from typing import List, Dict
 class GitUtils:
     """Utility class for Git operations"""
 
+    def __init__(self):
+        # Paths already confirmed to be repositories. Only positive results are
+        # kept, so a directory initialized later is picked up on the next check.
+        self._known_repos = set()
+
     async def init_repo(self, repo_path: Path):
         """Initializes a new Git repository in the specified path."""
         try:
             await self._run_git_command(repo_path, ['init'])
+            self._known_repos.add(Path(repo_path))
             return True
         except Exception:
             return False
@@ -23,9 +29,21 @@ class GitUtils:
         Retrieves staged changes and returns a dictionary mapping
         filename to its specific diff content.
         """
+        # One full diff split on its per-file headers instead of one git call per file.
+        staged_files, full_diff = await asyncio.gather(
+            self.get_staged_files(repo_path),
+            self.get_staged_diff(repo_path),
+        )
+        blocks = []
+        for line in full_diff.splitlines(keepends=True):
+            if line.startswith('diff --git ') or not blocks:
+                blocks.append([])
+            blocks[-1].append(line)
+        if len(blocks) == len(staged_files):
+            return {file: "".join(block).strip() for file, block in zip(staged_files, blocks)}
+
+        # Headers and names did not line up (unusual rename or diff config); ask per file.
         file_diffs = {}
-        staged_files = await self.get_staged_files(repo_path)
-        
         for file in staged_files:
             # Get the diff for each file individually
             diff_content = await self._run_git_command(repo_path, ['diff', '--cached', '--', file])
@@ -43,22 +61,24 @@ class GitUtils:
         result = await self._run_git_command(repo_path, ['status', '--porcelain'])
         return [line.strip().split(" ", 1)[1] for line in result.splitlines() if line.strip()]
 
-    async def get_local_branches(self, repo_path: Path) -> List[str]:
+    async def get_local_branches(self, repo_path: Path, fetch: bool = True) -> List[str]:
         """Get a list of local branch names."""
         # --- FIX: Fetch first to ensure the list is up to date ---
-        try:
-            await self._run_git_command(repo_path, ['fetch', 'origin'])
-        except Exception:
-            pass # Continue even if fetch fails
+        if fetch:
+            try:
+                await self._run_git_command(repo_path, ['fetch', 'origin'])
+            except Exception:
+                pass # Continue even if fetch fails
         result = await self._run_git_command(repo_path, ['branch', '--list'])
         return [b.replace('*', '').strip() for b in result.splitlines()]
 
-    async def get_all_branches(self, repo_path: Path) -> List[str]:
+    async def get_all_branches(self, repo_path: Path, fetch: bool = True) -> List[str]:
         """Get a list of all remote branch names."""
-        try:
-            await self._run_git_command(repo_path, ['fetch', 'origin'])
-        except Exception:
-            pass
+        if fetch:
+            try:
+                await self._run_git_command(repo_path, ['fetch', 'origin'])
+            except Exception:
+                pass
 
         result = await self._run_git_command(repo_path, ['branch', '-r'])
         branches = []
@@ -115,7 +135,13 @@ class GitUtils:
 
     async def is_git_repo(self, repo_path: Path) -> bool:
         """Check if the directory is a git repository."""
-        return (repo_path / ".git").is_dir()
+        repo_path = Path(repo_path)
+        if repo_path in self._known_repos:
+            return True
+        if (repo_path / ".git").is_dir():
+            self._known_repos.add(repo_path)
+            return True
+        return False
     
     async def get_status(self, repo_path: Path) -> str:
         """Get the status of the git repository."""
@@ -134,9 +160,10 @@ class GitUtils:
         return await self._run_git_command(repo_path, ['log', f'-{count}', '--oneline'])
     
     async def add_files(self, repo_path: Path, file_paths: List[str]) -> bool:
-        """Add multiple files to git staging."""
+        """Add multiple files to git staging in a single git invocation."""
         try:
-            await self._run_git_command(repo_path, ['add'] + file_paths)
+            # '--' keeps a path that starts with '-' from being read as an option.
+            await self._run_git_command(repo_path, ['add', '--', *file_paths])
             return True
         except Exception:
             return False
@@ -1,38 +1,86 @@
 import re
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-def extract_file_content_from_response(text: str) -> List[Dict[str, str]]:
+FILE_TAG_PATTERN = re.compile(r'<file\s+path=["\'](.*?)["\']>(.*?)</file>', re.DOTALL)
+
+def extract_file_content_from_response(text: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
     """
     Extracts file content from an AI's response. It robustly handles two formats:
     1. The preferred custom XML-like tag: <file path="..."></file>
     2. A common fallback markdown block with a path attribute: ```... path="..."
+    If limit is given, scanning stops once that many blocks have been found.
     """
     extracted_items = []
 
+    # Conversational replies carry neither format; skip both scans.
+    has_fence = "```" in text
+    if not has_fence and "<file" not in text:
+        return extracted_items
+
     # 1. Try to find the preferred <file> tag format first.
-    xml_pattern = re.compile(r'<file\s+path=["\'](.*?)["\']>(.*?)</file>', re.DOTALL)
-    for match in xml_pattern.finditer(text):
+    for match in FILE_TAG_PATTERN.finditer(text):
         path = match.group(1).strip()
         content = match.group(2).strip()
         if path and content:
             extracted_items.append({"filename": path, "code": content})
+            if len(extracted_items) == limit:
+                break
     
     if extracted_items:
         return extracted_items
 
     # 2. If no <file> tags, fall back to finding markdown blocks with a path attribute.
     # This handles the model's "stubborn" output.
-    md_pattern = re.compile(r"```[^\n]*?(?:path|filename)=[\"'](.*?)[\"'][^\n]*\n(.*?)\n```", re.DOTALL)
-    for match in md_pattern.finditer(text):
-        path = match.group(1).strip().lstrip('@') # Also strip @ here for good measure
-        content = match.group(2).strip()
+    if not has_fence:
+        return extracted_items
+    pos = text.find("```")
+    while pos != -1:
+        info_end = text.find("\n", pos + 3)
+        if info_end == -1:
+            break
+        path = _path_from_info_line(text[pos + 3:info_end])
+        if path is None:
+            # Not a path-annotated fence; the next fence may still open one.
+            pos = text.find("```", pos + 3)
+            continue
+        body_end = text.find("\n```", info_end + 1)
+        if body_end == -1:
+            break
+        path = path.strip().lstrip('@') # Also strip @ here for good measure
+        content = text[info_end + 1:body_end].strip()
         if path and content:
             extracted_items.append({"filename": path, "code": content})
+            if len(extracted_items) == limit:
+                break
+        pos = text.find("```", body_end + 4)
 
     return extracted_items
 
 
+def _path_from_info_line(info: str) -> Optional[str]:
+    """
+    Returns the quoted value of the leftmost `path=` or `filename=` attribute on a fence info line.
+    The key must be followed by a quote but may carry a prefix, so `file_path=` and
+    `filepath=` count as `path=`.
+    """
+    best = None
+    for key in ('path=', 'filename='):
+        start = info.find(key)
+        while start != -1:
+            after = start + len(key)
+            if info[after:after + 1] in ('"', "'"):
+                if best is None or start < best[0]:
+                    best = (start, after + 1)
+                break
+            start = info.find(key, start + 1)
+    if best is None:
+        return None
+    value = info[best[1]:]
+    end = min((i for i in (value.find('"'), value.find("'")) if i != -1), default=-1)
+    return value[:end] if end != -1 else None
+
+
 def build_file_tree(file_paths: List[str]) -> str:
     """
     Builds a textual representation of a file tree from a list of file paths.
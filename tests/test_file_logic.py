@@ -0,0 +1,25 @@
+import asyncio
+from types import SimpleNamespace
+
+from ai_assistant.logic.file_logic import new_file, save_code
+from ai_assistant.services.file_service import FileService
+
+
+def _session(work_dir):
+    config = SimpleNamespace(work_dir=work_dir)
+    return SimpleNamespace(config=config, file_service=FileService(config), set_context_file=lambda *args: None)
+
+
+def test_save_outside_project_leaves_no_directories(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    session = _session(project)
+    assert asyncio.run(save_code(session, "../escaped/deep/x.py", "x = 1")) is False
+    assert asyncio.run(new_file(session, "../escaped2/y.py")) is False
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["project"]
+
+
+def test_save_creates_missing_directories_inside_project(tmp_path):
+    session = _session(tmp_path)
+    assert asyncio.run(save_code(session, "pkg/sub/x.py", "x = 1")) is True
+    assert (tmp_path / "pkg" / "sub" / "x.py").read_text() == "x = 1"
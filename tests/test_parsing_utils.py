@@ -0,0 +1,41 @@
+from ai_assistant.utils.parsing_utils import extract_file_content_from_response
+
+
+def test_file_tag_format():
+    text = 'Here you go:\n<file path="src/app.py">print("hi")</file>'
+    assert extract_file_content_from_response(text) == [{"filename": "src/app.py", "code": 'print("hi")'}]
+
+
+def test_fence_with_path_attribute():
+    text = '```python path="a.py"\nx = 1\n```'
+    assert extract_file_content_from_response(text) == [{"filename": "a.py", "code": "x = 1"}]
+
+
+def test_fence_with_filename_attribute_and_at_prefix():
+    text = "```js filename='@web/index.js'\nconsole.log(1)\n```"
+    assert extract_file_content_from_response(text) == [{"filename": "web/index.js", "code": "console.log(1)"}]
+
+
+def test_fence_skips_unquoted_look_alike_before_real_path():
+    text = '```python filepath=main path="a.py"\nx = 1\n```'
+    assert extract_file_content_from_response(text) == [{"filename": "a.py", "code": "x = 1"}]
+
+
+def test_fence_accepts_prefixed_path_keys():
+    for key in ("file_path", "filepath"):
+        text = f'```python {key}="src/app.py"\nx=1\n```'
+        assert extract_file_content_from_response(text) == [{"filename": "src/app.py", "code": "x=1"}]
+
+
+def test_leftmost_attribute_wins():
+    text = '```python filename="first.py" path="second.py"\nx = 1\n```'
+    assert extract_file_content_from_response(text)[0]["filename"] == "first.py"
+
+
+def test_plain_fence_is_skipped_for_later_annotated_one():
+    text = '```python\nno path\n```\n\n```python path="b.py"\ny = 2\n```'
+    assert extract_file_content_from_response(text) == [{"filename": "b.py", "code": "y = 2"}]
+
+
+def test_plain_text_has_no_blocks():
+    assert extract_file_content_from_response("just chatting") == []